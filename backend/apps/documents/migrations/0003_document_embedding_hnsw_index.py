@@ -0,0 +1,24 @@
+# Generated manually on 2026-10-15
+
+from django.db import migrations
+import pgvector.django
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="document",
+            index=pgvector.django.HnswIndex(
+                fields=["embedding"],
+                m=16,
+                ef_construction=64,
+                name="documents_embedding_hnsw",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+    ]
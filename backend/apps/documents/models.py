@@ -6,7 +6,7 @@ import uuid
 from django.db import models
 from django.contrib.postgres.fields import ArrayField
 from django.utils.translation import gettext_lazy as _
-from pgvector.django import VectorField
+from pgvector.django import HnswIndex, VectorField
 
 from apps.tenants.models import Tenant
 
@@ -160,6 +160,13 @@ class Document(models.Model):
             models.Index(fields=['content_type', 'is_active']),
             models.Index(fields=['freshness_date']),
             models.Index(fields=['-times_retrieved']),
+            HnswIndex(
+                name='documents_embedding_hnsw',
+                fields=['embedding'],
+                m=16,
+                ef_construction=64,
+                opclasses=['vector_cosine_ops'],
+            ),
         ]
     
     def __str__(self):
@@ -3,11 +3,40 @@ Celery tasks for property ingestion.
 """
 
 from celery import shared_task
+import asyncio
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+def dispatch_in_batches(task, items, batch_size, *args):
+    """
+    Queue task(batch, *args) for each batch_size slice of items.
+    
+    All messages are sent as one Celery group over a single producer
+    connection, instead of one broker round-trip per .delay() call.
+    
+    Returns:
+        GroupResult for the queued tasks
+    """
+    from celery import group
+    
+    items = list(items)
+    signatures = [
+        task.s(items[i:i + batch_size], *args)
+        for i in range(0, len(items), batch_size)
+    ]
+    
+    with task.app.producer_or_acquire() as producer:
+        return group(signatures).apply_async(producer=producer)
+
+
+def _get_embeddings_client():
+    from core.llm.clients import get_embeddings_client
+    return get_embeddings_client()
+
+
 @shared_task(bind=True, max_retries=3)
 def ingest_url_task(self, url, tenant_id, user_id):
     """
@@ -69,6 +98,137 @@ def ingest_url_task(self, url, tenant_id, user_id):
         }
 
 
+async def _ingest_many(urls):
+    """
+    Scrape and extract URLs concurrently.
+    
+    Scrapes share one httpx connection pool; extraction (a blocking LLM call)
+    runs in worker threads so the requests overlap.
+    
+    Returns:
+        List of (url, extracted_data, error) tuples in input order, where
+        error is the exception raised for that URL (None on success)
+    """
+    from core.scraping.scraper import scrape_urls_async
+    from core.llm.extraction import extract_property_data
+    
+    scraped = await scrape_urls_async(urls)
+    
+    async def _extract(url, scraped_data):
+        if isinstance(scraped_data, Exception):
+            logger.error(f"Error scraping URL {url}: {scraped_data}")
+            return url, None, scraped_data
+        if not scraped_data.get('success'):
+            return url, None, Exception("Failed to scrape URL")
+        
+        html_content = scraped_data.get('html', scraped_data.get('text', ''))
+        try:
+            extracted_data = await asyncio.to_thread(extract_property_data, html_content, url=url)
+            return url, extracted_data, None
+        except Exception as e:
+            logger.error(f"Error processing URL {url}: {e}")
+            return url, None, e
+    
+    return await asyncio.gather(*(_extract(url, data) for url, data in zip(urls, scraped)))
+
+
+@shared_task(bind=True, max_retries=3)
+def ingest_urls_batch_task(self, urls, tenant_id, user_id):
+    """
+    Async task to ingest a batch of property URLs.
+    
+    Scraping and extraction are network-bound, so all URLs are processed
+    concurrently; the properties are then inserted with one bulk_create.
+    URLs that failed with a scraping or extraction error are retried with
+    exponential backoff, like ingest_url_task.
+    
+    Args:
+        urls: List of property URLs
+        tenant_id: Tenant UUID
+        user_id: User UUID who initiated the task
+    """
+    
+    from core.scraping.scraper import ScraperError
+    from core.llm.extraction import ExtractionError
+    from apps.properties.models import Property
+    from apps.tenants.models import Tenant
+    
+    logger.info(f"Starting async batch ingestion for {len(urls)} URLs")
+    
+    tenant = Tenant.objects.get(id=tenant_id)
+    
+    outcomes = asyncio.run(_ingest_many(urls))
+    
+    # Rows that already exist are skipped by the unique constraint, and
+    # bulk_create(ignore_conflicts=True) returns them anyway, so leave
+    # them out up front to report how many rows were really inserted
+    existing = set(
+        Property.objects.filter(
+            tenant=tenant,
+            source_url__in=[extracted_data.get('source_url') or url for url, extracted_data, _ in outcomes if extracted_data]
+        ).values_list('source_url', flat=True)
+    )
+    
+    to_create = []
+    skipped = 0
+    failed = []
+    retry_urls = []
+    retry_error = None
+    for url, extracted_data, error in outcomes:
+        if isinstance(error, (ScraperError, ExtractionError)):
+            retry_urls.append(url)
+            retry_error = error
+            failed.append({'url': url, 'error': str(error)})
+            continue
+        if error:
+            failed.append({'url': url, 'error': str(error)})
+            continue
+        
+        source_url = extracted_data.get('source_url') or url
+        if source_url in existing:
+            skipped += 1
+            continue
+        existing.add(source_url)
+        
+        extracted_data['tenant'] = tenant
+        if not extracted_data.get('user_roles'):
+            extracted_data['user_roles'] = ['buyer', 'staff', 'admin']
+        
+        try:
+            property_obj = Property(**extracted_data)
+        except TypeError as e:
+            failed.append({'url': url, 'error': str(e)})
+            continue
+        
+        # bulk_create bypasses save(), which normally fills this in
+        property_obj.content_for_search = property_obj.generate_search_content()
+        to_create.append(property_obj)
+    
+    # ignore_conflicts still covers rows inserted concurrently by another task
+    Property.objects.bulk_create(to_create, ignore_conflicts=True)
+    
+    logger.info(
+        f"Batch ingestion finished: {len(to_create)} created, {skipped} already existed, "
+        f"{len(failed)} failed"
+    )
+    
+    if retry_urls and self.request.retries < self.max_retries:
+        # Retry with exponential backoff, only for the URLs that failed
+        logger.info(f"🔄 Retrying {len(retry_urls)} URLs (attempt {self.request.retries + 1}/{self.max_retries})")
+        raise self.retry(
+            args=(retry_urls, tenant_id, user_id),
+            exc=retry_error,
+            countdown=2 ** self.request.retries
+        )
+    
+    return {
+        'status': 'success',
+        'created': len(to_create),
+        'skipped': skipped,
+        'failed': failed
+    }
+
+
 @shared_task
 def generate_property_embedding_task(property_id):
     """
@@ -79,28 +239,73 @@ def generate_property_embedding_task(property_id):
     """
     
     from apps.properties.models import Property
-    from langchain_openai import OpenAIEmbeddings
-    from django.conf import settings
+    from core.llm.embedding_cache import get_or_compute
     
     try:
-        property_obj = Property.objects.get(id=property_id)
+        property_obj = Property.objects.only('id', 'content_for_search').get(id=property_id)
         
         if not property_obj.content_for_search:
+            # Building search content needs the full row
+            property_obj = Property.objects.get(id=property_id)
             property_obj.content_for_search = property_obj.generate_search_content()
         
-        # Generate embedding
-        embeddings = OpenAIEmbeddings(
-            model=settings.OPENAI_EMBEDDING_MODEL,
-            openai_api_key=settings.OPENAI_API_KEY
+        # Generate embedding (skips the API call when the content is unchanged)
+        embedding = get_or_compute(
+            property_obj.content_for_search,
+            _get_embeddings_client().embed_query
         )
-        
-        embedding = embeddings.embed_query(property_obj.content_for_search)
-        property_obj.embedding = embedding
+        property_obj.embedding = np.asarray(embedding, dtype=np.float32)
         property_obj.save(update_fields=['embedding', 'content_for_search'])
     except Exception as e:
         logger.error(f"Error generating embedding for property {property_id}: {e}")
 
 
+@shared_task
+def generate_embeddings_batch_task(property_ids):
+    """
+    Generate embeddings for many properties with a single API request.
+    
+    Args:
+        property_ids: List of Property UUIDs
+        
+    Returns:
+        dict with number of properties embedded
+    """
+    
+    from apps.properties.models import Property
+    from core.llm.embedding_cache import get_or_compute_many
+    
+    try:
+        properties = list(
+            Property.objects.filter(id__in=property_ids).only('id', 'content_for_search')
+        )
+        
+        if not properties:
+            return {'status': 'success', 'embedded': 0}
+        
+        # Backfill search content for rows saved before it existed
+        needs_content = {p.id: p for p in properties if not p.content_for_search}
+        if needs_content:
+            for property_obj in Property.objects.filter(id__in=list(needs_content)):
+                needs_content[property_obj.id].content_for_search = property_obj.generate_search_content()
+        
+        texts = [p.content_for_search for p in properties]
+        vectors = get_or_compute_many(texts, _get_embeddings_client().embed_documents)
+        
+        for property_obj, vector in zip(properties, vectors):
+            property_obj.embedding = np.asarray(vector, dtype=np.float32)
+        
+        Property.objects.bulk_update(properties, ['embedding', 'content_for_search'], batch_size=500)
+        
+        logger.info(f"✅ Generated {len(properties)} embeddings in one batch")
+        
+        return {'status': 'success', 'embedded': len(properties)}
+        
+    except Exception as e:
+        logger.error(f"❌ Error generating batch embeddings: {e}", exc_info=True)
+        return {'status': 'failed', 'error': str(e)}
+
+
 @shared_task(bind=True, max_retries=3)
 def generate_embedding_async(self, property_id: str):
     """
@@ -119,15 +324,22 @@ def generate_embedding_async(self, property_id: str):
         
         logger.info(f"🔮 [ASYNC] Starting embedding generation for property: {property_id}")
         
-        # Get property
-        property_obj = Property.objects.get(id=property_id)
+        # Get property (only the fields the embedding text is built from)
+        property_obj = Property.objects.only(
+            'id', 'property_name', 'description', 'location', 'property_type',
+            'bedrooms', 'bathrooms', 'square_meters', 'lot_size_m2',
+            'price_usd', 'amenities'
+        ).get(id=property_id)
         
         # Generate embedding
         embedding = generate_property_embedding(property_obj)
         
         if embedding:
-            property_obj.embedding = embedding
-            property_obj.save(update_fields=['embedding'])
+            # Write the vector directly: Property.save() reads content_for_search,
+            # which would reload the deferred column this query skips
+            Property.objects.filter(id=property_obj.id).update(
+                embedding=np.asarray(embedding, dtype=np.float32)
+            )
             logger.info(f"✅ [ASYNC] Embedding generated successfully for: {property_obj.property_name} (dimension: {len(embedding)})")
             return {
                 'success': True,
@@ -184,20 +396,14 @@ def generate_document_embedding_task(document_id):
     """
     
     from apps.documents.models import Document
-    from langchain_openai import OpenAIEmbeddings
-    from django.conf import settings
+    from core.llm.embedding_cache import get_or_compute
     
     try:
         document = Document.objects.get(id=document_id)
         
         # Generate embedding
-        embeddings = OpenAIEmbeddings(
-            model=settings.OPENAI_EMBEDDING_MODEL,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
-        
-        embedding = embeddings.embed_query(document.content)
-        document.embedding = embedding
+        embedding = get_or_compute(document.content, _get_embeddings_client().embed_query)
+        document.embedding = np.asarray(embedding, dtype=np.float32)
         document.save(update_fields=['embedding'])
         
         logger.info(f"Generated embedding for document {document_id}")
@@ -34,6 +34,9 @@ class IngestBatchView(APIView):
     
     permission_classes = [AllowAny]
     
+    # URLs per Celery task when processing asynchronously
+    ASYNC_BATCH_SIZE = 10
+    
     def post(self, request):
         """Process multiple URLs in batch."""
         
@@ -54,24 +57,20 @@ class IngestBatchView(APIView):
             )
         
         if run_async:
-            # Queue for async processing with Celery
-            from apps.ingestion.tasks import ingest_url_task
+            # Queue for async processing with Celery, a few URLs per task
+            from apps.ingestion.tasks import dispatch_in_batches, ingest_urls_batch_task
             
-            task_ids = []
-            for url in urls:
-                if request.user.is_authenticated:
-                    tenant_id = str(request.user.tenant_id)
-                    user_id = str(request.user.id)
-                else:
-                    tenant_id = str(Tenant.objects.first().id)
-                    user_id = str(CustomUser.objects.first().id)
-
-                task = ingest_url_task.delay(
-                    url=url,
-                    tenant_id=tenant_id,
-                    user_id=user_id
-                )
-                task_ids.append(task.id)
+            if request.user.is_authenticated:
+                tenant_id = str(request.user.tenant_id)
+                user_id = str(request.user.id)
+            else:
+                tenant_id = str(Tenant.objects.first().id)
+                user_id = str(CustomUser.objects.first().id)
+            
+            group_result = dispatch_in_batches(
+                ingest_urls_batch_task, urls, self.ASYNC_BATCH_SIZE, tenant_id, user_id
+            )
+            task_ids = [result.id for result in group_result.results]
             
             return Response({
                 'status': 'queued',
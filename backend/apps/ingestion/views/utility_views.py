@@ -164,10 +164,14 @@ class GenerateEmbeddingsView(APIView):
     
     POST /ingest/generate-embeddings
     {
-        "force": false  // Optional: regenerate even if embeddings exist
+        "force": false,  // Optional: regenerate even if embeddings exist
+        "async": false   // Optional: queue batched Celery tasks instead of blocking
     }
     """
     
+    # Properties per embeddings API request when dispatching async
+    ASYNC_BATCH_SIZE = 100
+    
     authentication_classes = []
     permission_classes = [AllowAny]  # TODO: Add admin-only permission in production
     
@@ -177,6 +181,7 @@ class GenerateEmbeddingsView(APIView):
         logger.info("=== GenerateEmbeddingsView POST request received ===")
         
         force = request.data.get('force', False)
+        use_async = request.data.get('async', False)
         
         try:
             # Get properties that need embeddings
@@ -199,6 +204,23 @@ class GenerateEmbeddingsView(APIView):
                     'coverage_percent': 100.0
                 }, status=status.HTTP_200_OK)
             
+            if use_async:
+                from ..tasks import dispatch_in_batches, generate_embeddings_batch_task
+                
+                property_ids = [str(pid) for pid in properties.values_list('id', flat=True)]
+                group_result = dispatch_in_batches(
+                    generate_embeddings_batch_task, property_ids, self.ASYNC_BATCH_SIZE
+                )
+                
+                logger.info(f"📤 Queued {len(property_ids)} properties in {len(group_result.results)} embedding batches")
+                
+                return Response({
+                    'status': 'queued',
+                    'message': f'Queued {len(property_ids)} properties for embedding',
+                    'queued': len(property_ids),
+                    'batches': len(group_result.results)
+                }, status=status.HTTP_202_ACCEPTED)
+            
             success_count = 0
             error_count = 0
             errors = []
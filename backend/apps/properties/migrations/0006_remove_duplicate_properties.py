@@ -2,28 +2,27 @@
 # Data migration to remove duplicate properties before adding unique constraint
 
 from django.db import migrations
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 
 
 def remove_duplicate_properties(apps, schema_editor):
     """Remove duplicate properties keeping the most recent one."""
     Property = apps.get_model('properties', 'Property')
     
-    # Find all properties with source_url
-    all_properties = Property.objects.filter(source_url__isnull=False).order_by('tenant_id', 'source_url', '-created_at')
-    
-    seen = set()
-    duplicates_to_delete = []
-    
-    for prop in all_properties:
-        key = (str(prop.tenant_id), prop.source_url)
-        if key in seen:
-            # This is a duplicate, mark for deletion
-            duplicates_to_delete.append(prop.id)
-        else:
-            # First occurrence, keep it
-            seen.add(key)
+    # Rank rows per (tenant, source_url) in the database, newest first;
+    # only the ids of rows ranked after the first are sent back
+    ranked = Property.objects.filter(source_url__isnull=False).annotate(
+        row_number=Window(
+            expression=RowNumber(),
+            partition_by=[F('tenant_id'), F('source_url')],
+            order_by=F('created_at').desc(),
+        )
+    )
+    duplicates_to_delete = list(ranked.filter(row_number__gt=1).values_list('id', flat=True))
     
     if duplicates_to_delete:
+        # ORM delete so related images are cascaded like before
         deleted_count = Property.objects.filter(id__in=duplicates_to_delete).delete()[0]
         print(f"Removed {deleted_count} duplicate properties")
     else:
@@ -0,0 +1,24 @@
+# Generated manually on 2026-10-15
+
+from django.db import migrations
+import pgvector.django
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0011_property_content_type_property_page_type"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="property",
+            index=pgvector.django.HnswIndex(
+                fields=["embedding"],
+                m=16,
+                ef_construction=64,
+                name="properties_embedding_hnsw",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+    ]
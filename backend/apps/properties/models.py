@@ -8,7 +8,7 @@ from django.db import models
 from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.search import SearchVectorField
 from django.utils.translation import gettext_lazy as _
-from pgvector.django import VectorField
+from pgvector.django import HnswIndex, VectorField
 
 from apps.tenants.models import Tenant
 
@@ -399,6 +399,13 @@ class Property(models.Model):
             models.Index(fields=['property_type', 'location']),
             models.Index(fields=['price_usd']),
             models.Index(fields=['-created_at']),
+            HnswIndex(
+                name='properties_embedding_hnsw',
+                fields=['embedding'],
+                m=16,
+                ef_construction=64,
+                opclasses=['vector_cosine_ops'],
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
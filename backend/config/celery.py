@@ -4,6 +4,7 @@ Celery configuration for Real Estate LLM project.
 
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 # Set default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
@@ -17,6 +18,13 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 
+@worker_process_init.connect
+def init_worker_clients(**kwargs):
+    """Build shared API clients once per worker process, after the fork."""
+    from core.llm.clients import warm_clients
+    warm_clients()
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     """Debug task for testing Celery."""
@@ -249,6 +249,18 @@ else:
         }
     }
 
+# Exact-match extraction results live on local disk so they survive Redis
+# flushes and work without Redis; keys are content hashes (see extraction.py)
+EXTRACTION_CACHE_DIR = env('EXTRACTION_CACHE_DIR', default=os.path.join(BASE_DIR, '.cache', 'extractions'))
+CACHES['extractions'] = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': EXTRACTION_CACHE_DIR,
+    'TIMEOUT': None,
+    'OPTIONS': {
+        'MAX_ENTRIES': env.int('EXTRACTION_CACHE_MAX_ENTRIES', default=20000),
+    },
+}
+
 # Celery Configuration
 CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='redis://localhost:6379/1')
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
@@ -275,6 +287,7 @@ ANTHROPIC_MAX_TOKENS = env.int('ANTHROPIC_MAX_TOKENS', default=4000)
 LLM_CACHE_ENABLED = env.bool('LLM_CACHE_ENABLED', default=True)
 LLM_CACHE_TTL_HOURS = env.int('LLM_CACHE_TTL_HOURS', default=24)
 SEMANTIC_CACHE_THRESHOLD = env.float('SEMANTIC_CACHE_THRESHOLD', default=0.95)
+CONTENT_TYPE_CACHE_THRESHOLD = env.float('CONTENT_TYPE_CACHE_THRESHOLD', default=0.92)
 VECTOR_SEARCH_TOP_K = env.int('VECTOR_SEARCH_TOP_K', default=5)
 HYBRID_SEARCH_ALPHA = env.float('HYBRID_SEARCH_ALPHA', default=0.5)
 EMBEDDING_DIMENSIONS = env.int('EMBEDDING_DIMENSIONS', default=1536)
@@ -304,6 +317,9 @@ DEFAULT_TENANT_ID = env('DEFAULT_TENANT_ID', default=None)
 ENABLE_PROPERTY_SCRAPING = env.bool('ENABLE_PROPERTY_SCRAPING', default=True)
 ENABLE_PDF_PROCESSING = env.bool('ENABLE_PDF_PROCESSING', default=True)
 ENABLE_SEMANTIC_CACHE = env.bool('ENABLE_SEMANTIC_CACHE', default=True)
+# Reuse LLM content type verdicts for near-duplicate pages (one embedding
+# call per LLM fallback); see core.llm.semantic_cache
+ENABLE_CONTENT_TYPE_SEMANTIC_CACHE = env.bool('ENABLE_CONTENT_TYPE_SEMANTIC_CACHE', default=False)
 ENABLE_ASYNC_EMBEDDINGS = env.bool('ENABLE_ASYNC_EMBEDDINGS', default=True)
 
 # Chat Configuration
@@ -0,0 +1,52 @@
+"""
+Shared API clients for LLM and embedding calls.
+
+Each client owns an HTTP connection pool, so building one per call pays a
+new TLS handshake every time. These getters create the clients once per
+process and reuse them; Celery workers warm them at startup.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_openai_client = None
+_embeddings_client = None
+
+
+def get_openai_client():
+    """Return the process-wide openai.OpenAI client."""
+    global _openai_client
+
+    if _openai_client is None:
+        with _lock:
+            if _openai_client is None:
+                import openai
+                _openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+    return _openai_client
+
+
+def get_embeddings_client():
+    """Return the process-wide langchain OpenAIEmbeddings client."""
+    global _embeddings_client
+
+    if _embeddings_client is None:
+        with _lock:
+            if _embeddings_client is None:
+                from langchain_openai import OpenAIEmbeddings
+                _embeddings_client = OpenAIEmbeddings(
+                    model=settings.OPENAI_EMBEDDING_MODEL,
+                    openai_api_key=settings.OPENAI_API_KEY
+                )
+    return _embeddings_client
+
+
+def warm_clients():
+    """Create all shared clients up front (called when a worker starts)."""
+    get_openai_client()
+    get_embeddings_client()
+    logger.info("🔌 Shared OpenAI clients initialized")
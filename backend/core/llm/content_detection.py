@@ -4,11 +4,29 @@ Detects the type of content (real_estate, tour, restaurant, etc.) using multiple
 """
 
 import logging
+import re
+from functools import lru_cache
 from typing import Optional, Dict, Tuple
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 
-from .content_types import CONTENT_TYPES
+from .content_types import (
+    CONTENT_TYPES,
+    TYPE_KEYS,
+    KEYWORDS_FLAT,
+    KEYWORD_OWNER,
+    KEYWORD_TOTALS,
+    DOMAINS_FLAT,
+    DOMAIN_OWNER,
+)
+from . import json_utils
+from .html_utils import parse_visible_tree
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +35,36 @@ logger = logging.getLogger(__name__)
 # DETECTION STRATEGIES
 # ============================================================================
 
+def _build_domain_matcher():
+    """
+    Compile every domain pattern into one regex.
+    
+    Alternatives are ordered by CONTENT_TYPES priority and wrapped in a
+    lookahead so overlapping hits are all reported; the caller keeps the
+    highest-priority one, matching the original nested-loop semantics.
+    """
+    priority = {}
+    for domain_pattern, index in zip(DOMAINS_FLAT, DOMAIN_OWNER):
+        priority.setdefault(domain_pattern, (index, TYPE_KEYS[index]))
+    
+    alternation = '|'.join(re.escape(p) for p in priority)
+    return re.compile(f'(?=({alternation}))'), priority
+
+
+_DOMAIN_RE, _DOMAIN_PRIORITY = _build_domain_matcher()
+
+
+@lru_cache(maxsize=4096)
+def _domain_lookup(domain: str) -> Optional[str]:
+    """
+    Map a normalized domain to its content type.
+    
+    Cached because bulk ingestion usually hits the same few sites repeatedly.
+    """
+    hits = [_DOMAIN_PRIORITY[m.group(1)] for m in _DOMAIN_RE.finditer(domain)]
+    return min(hits)[1] if hits else None
+
+
 def detect_by_domain(url: str) -> Optional[str]:
     """
     Detect content type by URL domain.
@@ -31,72 +79,134 @@ def detect_by_domain(url: str) -> Optional[str]:
         return None
     
     try:
-        domain = urlparse(url).netloc.lower()
-        # Remove www. prefix
-        domain = domain.replace('www.', '')
-        
-        logger.info(f"🔍 Detecting by domain: {domain}")
+        domain = urlparse(url).netloc.lower().removeprefix('www.')
         
-        # Check each content type's domain list
-        for content_type, config in CONTENT_TYPES.items():
-            for domain_pattern in config['domains']:
-                if domain_pattern.lower() in domain:
-                    logger.info(f"✅ Domain match: {domain} → {content_type}")
-                    return content_type
-        
-        logger.info(f"⚠️ No domain match for: {domain}")
-        return None
+        content_type = _domain_lookup(domain)
+        logger.debug(f"🔍 Domain lookup: {domain} → {content_type}")
+        return content_type
         
     except Exception as e:
         logger.warning(f"Error parsing URL domain: {e}")
         return None
 
 
-def detect_by_keywords(html: str, min_confidence: float = 0.5) -> Tuple[Optional[str], float]:
+@lru_cache(maxsize=16)
+def _html_to_text(html: str, separator: str = '') -> str:
+    """
+    Return the visible text of an HTML document, without scripts and styles.
+    
+    Uses the lxml tree shared with page type detection; BeautifulSoup is
+    only used for fragments lxml refuses (e.g. empty documents). Memoized
+    so the keyword pass, the LLM fallback and repeated detect_content_type
+    calls on the same page share one parse.
+    
+    Args:
+        html: HTML content
+        separator: String placed between text nodes. With a non-empty
+            separator, text nodes are also stripped and blanks dropped.
+    """
+    tree = parse_visible_tree(html) if html else None
+    if tree is not None:
+        if not separator:
+            return tree.text_content()
+        return separator.join(t.strip() for t in tree.itertext() if t.strip())
+    
+    soup = BeautifulSoup(html or '', 'html.parser')
+    for script in soup(['script', 'style']):
+        script.decompose()
+    return soup.get_text(separator=separator, strip=bool(separator))
+
+
+@lru_cache(maxsize=16)
+def _keyword_text(html: str) -> str:
+    """Casefolded visible text used for keyword scanning, memoized per document."""
+    return _html_to_text(html).lower()
+
+
+# Every distinct keyword once (shared keywords are only searched once)
+_ALL_KEYWORDS = frozenset(KEYWORDS_FLAT)
+
+if AHOCORASICK_AVAILABLE:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _ALL_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+
+
+def _find_keywords(text: str) -> set:
+    """Return the set of known keywords that occur in the (lowercased) text."""
+    if AHOCORASICK_AVAILABLE:
+        return {keyword for _, keyword in _KEYWORD_AUTOMATON.iter(text)}
+    # Keywords shared between content types are only searched once
+    return {keyword for keyword in _ALL_KEYWORDS if keyword in text}
+
+
+@lru_cache(maxsize=16)
+def _best_keyword_match(text: str) -> Tuple[int, int, float]:
+    """
+    Score the (lowercased) text against every content type's keywords.
+    
+    Memoized per text: the fast pass and the LLM-fallback retry of
+    detect_content_type on the same page score it once.
+    
+    Returns:
+        (type index, matched keywords, confidence) of the best type,
+        index -1 if there are no content types
+    """
+    # Count keyword matches for each content type
+    found = _find_keywords(text)
+    
+    match_counts = [0] * len(TYPE_KEYS)
+    for keyword, owner in zip(KEYWORDS_FLAT, KEYWORD_OWNER):
+        if keyword in found:
+            match_counts[owner] += 1
+    
+    debug = logger.isEnabledFor(logging.DEBUG)
+    best_index, matches, confidence = -1, 0, -1.0
+    for index, keyword_matches in enumerate(match_counts):
+        total_keywords = KEYWORD_TOTALS[index]
+        
+        # Calculate confidence as percentage of keywords found
+        type_confidence = keyword_matches / total_keywords if total_keywords > 0 else 0.0
+        
+        if debug:
+            logger.debug(f"  {TYPE_KEYS[index]}: {keyword_matches}/{total_keywords} keywords ({type_confidence:.2%})")
+        
+        # Strictly greater: ties keep the earlier content type
+        if type_confidence > confidence:
+            best_index, matches, confidence = index, keyword_matches, type_confidence
+    
+    return best_index, matches, confidence
+
+
+def detect_by_keywords(
+    html: str,
+    min_confidence: float = 0.5,
+    text: Optional[str] = None
+) -> Tuple[Optional[str], float]:
     """
     Detect content type by analyzing keywords in the HTML content.
     
     Args:
         html: HTML content to analyze
         min_confidence: Minimum confidence threshold (0.0 to 1.0)
+        text: Already-extracted lowercased text (skips parsing html)
         
     Returns:
         Tuple of (content_type, confidence_score) or (None, 0.0)
     """
     try:
-        # Extract text from HTML
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(['script', 'style']):
-            script.decompose()
-        
-        text = soup.get_text().lower()
+        # Extract text from HTML (scripts and styles removed)
+        if text is None:
+            text = _keyword_text(html)
         
         logger.info(f"🔍 Detecting by keywords (text length: {len(text)} chars)")
         
-        # Count keyword matches for each content type
-        scores = {}
-        for content_type, config in CONTENT_TYPES.items():
-            keyword_matches = sum(1 for keyword in config['keywords'] if keyword.lower() in text)
-            total_keywords = len(config['keywords'])
-            
-            # Calculate confidence as percentage of keywords found
-            confidence = keyword_matches / total_keywords if total_keywords > 0 else 0.0
-            scores[content_type] = {
-                'matches': keyword_matches,
-                'total': total_keywords,
-                'confidence': confidence
-            }
-            
-            logger.debug(f"  {content_type}: {keyword_matches}/{total_keywords} keywords ({confidence:.2%})")
+        best_index, matches, confidence = _best_keyword_match(text)
         
-        # Find the type with highest confidence
-        if scores:
-            best_type = max(scores.items(), key=lambda x: x[1]['confidence'])
-            content_type = best_type[0]
-            confidence = best_type[1]['confidence']
-            matches = best_type[1]['matches']
+        # Report the type with highest confidence
+        if best_index >= 0:
+            content_type = TYPE_KEYS[best_index]
             
             logger.info(f"🏆 Best keyword match: {content_type} ({matches} keywords, {confidence:.2%} confidence)")
             
@@ -114,6 +224,46 @@ def detect_by_keywords(html: str, min_confidence: float = 0.5) -> Tuple[Optional
         return None, 0.0
 
 
+_classification_cache = None
+
+
+def _get_classification_cache():
+    """Return the process-wide semantic cache of LLM content-type verdicts."""
+    global _classification_cache
+    
+    if _classification_cache is None:
+        from django.conf import settings
+        from .semantic_cache import SemanticCache
+        
+        _classification_cache = SemanticCache(
+            'content_type',
+            dimensions=settings.EMBEDDING_DIMENSIONS,
+            threshold=getattr(settings, 'CONTENT_TYPE_CACHE_THRESHOLD', 0.92)
+        )
+    return _classification_cache
+
+
+def _get_preview_embedding(html: str):
+    """Embed the first 2KB of visible text, or None if the cache is disabled."""
+    from django.conf import settings
+    
+    if not getattr(settings, 'ENABLE_CONTENT_TYPE_SEMANTIC_CACHE', False):
+        return None
+    
+    from .embeddings import generate_embedding
+    
+    if not html:
+        return None
+    
+    preview = _html_to_text(html, separator=' ')[:2000]
+    return generate_embedding(preview) if preview else None
+
+
+def _is_model_verdict(result: Dict) -> bool:
+    """True if an OpenAI content type result came from a successful model call."""
+    return result.get('cost', 0) > 0 and not result.get('reasoning', '').startswith('Detection failed')
+
+
 def classify_with_llm(html: str, url: str = "", client=None) -> Tuple[str, float]:
     """
     Classify content type using LLM (last resort).
@@ -133,6 +283,14 @@ def classify_with_llm(html: str, url: str = "", client=None) -> Tuple[str, float
         # Import the robust detection function
         from core.llm.page_type_detection import detect_content_type as detect_ct_openai
         
+        # Near-duplicate pages (re-ingests, listings from the same site)
+        # reuse an earlier verdict: one embedding call instead of a chat call
+        preview_embedding = _get_preview_embedding(html)
+        if preview_embedding is not None:
+            cached = _get_classification_cache().lookup(preview_embedding)
+            if cached:
+                return cached['content_type'], cached['confidence']
+        
         result = detect_ct_openai(url=url, html=html)
         
         content_type = result['content_type']
@@ -140,6 +298,14 @@ def classify_with_llm(html: str, url: str = "", client=None) -> Tuple[str, float
         
         logger.info(f"✅ LLM detected: {content_type} (confidence: {confidence:.2%})")
         
+        # Error and no-HTML fallbacks are defaults, not verdicts: caching one
+        # would hand it to every similar page that follows
+        if preview_embedding is not None and _is_model_verdict(result):
+            _get_classification_cache().add(preview_embedding, {
+                'content_type': content_type,
+                'confidence': confidence
+            })
+        
         return content_type, confidence
         
     except ImportError:
@@ -152,28 +318,42 @@ def classify_with_llm(html: str, url: str = "", client=None) -> Tuple[str, float
         return 'real_estate', 0.3
 
 
+# Structured-output schema for the fallback classifier, built once. The enum
+# constrains decoding to a known content type key, so the reply never needs
+# cleanup or an "unknown type" fallback.
+_CLASSIFICATION_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {
+        'name': 'content_type_classification',
+        'strict': True,
+        'schema': {
+            'type': 'object',
+            'properties': {
+                'content_type': {'type': 'string', 'enum': list(TYPE_KEYS)},
+            },
+            'required': ['content_type'],
+            'additionalProperties': False,
+        },
+    },
+}
+
+
 def _simple_llm_classify(html: str, client=None) -> Tuple[str, float]:
     """Simple LLM classification fallback."""
-    import openai
-    from django.conf import settings
-    
     if client is None:
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        from .clients import get_openai_client
+        client = get_openai_client()
     
     try:
         # Extract a preview of the content
-        soup = BeautifulSoup(html, 'html.parser')
-        for script in soup(['script', 'style']):
-            script.decompose()
-        text_preview = soup.get_text(separator=' ', strip=True)[:2000]  # First 2000 chars
+        text_preview = _html_to_text(html, separator=' ')[:2000]  # First 2000 chars
         
-        classification_prompt = f"""Classify the following web content into ONE category. Return ONLY the category key, nothing else.
+        classification_prompt = f"""Classify the following web content into ONE category.
 
 Categories:
 - real_estate (properties for sale/rent)
 - tour (tours, activities, excursions)
 - restaurant (restaurants, dining, food)
-- accommodation (hotels, lodges, rentals)
 - local_tips (travel tips, advice, local knowledge)
 - transportation (buses, taxis, shuttles, routes)
 
@@ -185,14 +365,15 @@ Category:"""
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
-                {"role": "system", "content": "You are a content classification expert. Return only the category key."},
+                {"role": "system", "content": "You are a content classification expert."},
                 {"role": "user", "content": classification_prompt}
             ],
             temperature=0,
-            max_tokens=20
+            max_tokens=20,
+            response_format=_CLASSIFICATION_RESPONSE_FORMAT
         )
         
-        content_type = response.choices[0].message.content.strip().lower()
+        content_type = json_utils.loads(response.choices[0].message.content).get('content_type')
         
         # Validate that it's a known type
         if content_type in CONTENT_TYPES:
@@ -213,7 +394,7 @@ Category:"""
 
 def detect_content_type(
     url: str,
-    html: str,
+    html: Optional[str] = None,
     user_override: Optional[str] = None,
     use_llm_fallback: bool = False
 ) -> Dict[str, any]:
@@ -228,9 +409,10 @@ def detect_content_type(
     
     Args:
         url: Source URL
-        html: HTML content
+        html: HTML content. Only parsed when override and domain detection
+            both fail, so it may be omitted for domain-only classification.
         user_override: User-specified content type (highest priority)
-        use_llm_fallback: Whether to use LLM as last resort
+        use_llm_fallback: Whether to use LLM as last resort (needs html)
         
     Returns:
         Dict with:
@@ -268,7 +450,12 @@ def detect_content_type(
         }
     
     # Strategy 3: Keyword analysis (fast, decent accuracy)
-    keyword_type, keyword_confidence = detect_by_keywords(html, min_confidence=0.3)
+    # HTML is parsed once here; the LLM fallback reuses the cached parse.
+    if html:
+        text = _keyword_text(html)
+        keyword_type, keyword_confidence = detect_by_keywords(html, min_confidence=0.3, text=text)
+    else:
+        keyword_type, keyword_confidence = None, 0.0
     
     if keyword_type and keyword_confidence >= 0.7:
         # High confidence from keywords
@@ -280,8 +467,9 @@ def detect_content_type(
             'suggested_type': keyword_type
         }
     
-    # Strategy 4: LLM classification (optional, slow but accurate)
-    if use_llm_fallback:
+    # Strategy 4: LLM classification (optional, slow but accurate). It
+    # classifies the page content, so without HTML there is nothing to send
+    if use_llm_fallback and html:
         logger.info("🤖 Using LLM classification as fallback...")
         llm_type, llm_confidence = classify_with_llm(html, url=url)
         return {
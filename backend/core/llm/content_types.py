@@ -3,25 +3,45 @@ Content types configuration for multi-domain extraction.
 Defines prompts, schemas, and detection rules for different content types.
 """
 
-from typing import Dict, List, Any
+import re
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
+
+from .prompts import PROPERTY_EXTRACTION_PROMPT
 
 
 # ============================================================================
 # EXTRACTION PROMPTS FOR EACH CONTENT TYPE
 # ============================================================================
 
-# TOUR PROMPTS (Specific vs General)
-# ----------------------------------------------------------------------------
-
-TOUR_EXTRACTION_PROMPT = """You are a tour and activity extraction specialist. Extract tour/activity information from the provided HTML or text and return it as JSON.
-
-**Instructions:**
+# Blocks shared verbatim by several prompts below
+_INSTRUCTIONS_NORMALIZE_NUMBERS = """**Instructions:**
 1. Extract ONLY information explicitly stated in the source text
 2. For each field, include an "evidence" field showing where you found the information
 3. Use null for any field not found in the source
 4. Normalize all data (remove commas from numbers, standardize formats)
 5. DO NOT invent or assume information
+"""
+
+_INSTRUCTIONS_NORMALIZE = """**Instructions:**
+1. Extract ONLY information explicitly stated in the source text
+2. For each field, include an "evidence" field showing where you found the information
+3. Use null for any field not found in the source
+4. Normalize all data
+5. DO NOT invent or assume information
+"""
+
+_CONTENT_TAIL = """**Content to extract from:**
+{content}
+"""
+
 
+# TOUR PROMPTS (Specific vs General)
+# ----------------------------------------------------------------------------
+
+TOUR_EXTRACTION_PROMPT = """You are a tour and activity extraction specialist. Extract tour/activity information from the provided HTML or text and return it as JSON.
+
+""" + _INSTRUCTIONS_NORMALIZE_NUMBERS + """
 **Required Output Format:**
 ```json
 {{
@@ -67,9 +87,7 @@ TOUR_EXTRACTION_PROMPT = """You are a tour and activity extraction specialist. E
 }}
 ```
 
-**Content to extract from:**
-{content}
-"""
+""" + _CONTENT_TAIL
 
 
 TOUR_GUIDE_EXTRACTION_PROMPT = """Eres un especialista en extracción de información de guías de destinos turísticos. Esta página es una GUÍA GENERAL (no un tour individual), extrae información completa sobre tours y actividades en este destino.
@@ -262,20 +280,12 @@ REAL_ESTATE_GUIDE_EXTRACTION_PROMPT = """You are a real estate market guide extr
 }}
 ```
 
-**Content to extract from:**
-{content}
-"""
+""" + _CONTENT_TAIL
 
 
 RESTAURANT_EXTRACTION_PROMPT = """You are a restaurant and dining extraction specialist. Extract restaurant information from the provided HTML or text and return it as JSON.
 
-**Instructions:**
-1. Extract ONLY information explicitly stated in the source text
-2. For each field, include an "evidence" field showing where you found the information
-3. Use null for any field not found in the source
-4. Normalize all data (remove commas from numbers, standardize formats)
-5. DO NOT invent or assume information
-
+""" + _INSTRUCTIONS_NORMALIZE_NUMBERS + """
 **Required Output Format:**
 ```json
 {{
@@ -317,20 +327,12 @@ RESTAURANT_EXTRACTION_PROMPT = """You are a restaurant and dining extraction spe
 }}
 ```
 
-**Content to extract from:**
-{content}
-"""
+""" + _CONTENT_TAIL
 
 
 LOCAL_TIPS_EXTRACTION_PROMPT = """You are a local knowledge extraction specialist. Extract practical tips and local information from the provided HTML or text and return it as JSON.
 
-**Instructions:**
-1. Extract ONLY information explicitly stated in the source text
-2. For each field, include an "evidence" field showing where you found the information
-3. Use null for any field not found in the source
-4. Normalize all data
-5. DO NOT invent or assume information
-
+""" + _INSTRUCTIONS_NORMALIZE + """
 **Required Output Format:**
 ```json
 {{
@@ -358,20 +360,12 @@ LOCAL_TIPS_EXTRACTION_PROMPT = """You are a local knowledge extraction specialis
 }}
 ```
 
-**Content to extract from:**
-{content}
-"""
+""" + _CONTENT_TAIL
 
 
 TRANSPORTATION_EXTRACTION_PROMPT = """You are a transportation information extraction specialist. Extract transportation details from the provided HTML or text and return it as JSON.
 
-**Instructions:**
-1. Extract ONLY information explicitly stated in the source text
-2. For each field, include an "evidence" field showing where you found the information
-3. Use null for any field not found in the source
-4. Normalize all data
-5. DO NOT invent or assume information
-
+""" + _INSTRUCTIONS_NORMALIZE + """
 **Required Output Format:**
 ```json
 {{
@@ -414,21 +408,19 @@ TRANSPORTATION_EXTRACTION_PROMPT = """You are a transportation information extra
 }}
 ```
 
-**Content to extract from:**
-{content}
-"""
+""" + _CONTENT_TAIL
 
 
 # ============================================================================
 # CONTENT TYPE CONFIGURATION
 # ============================================================================
 
-CONTENT_TYPES: Dict[str, Dict[str, Any]] = {
+_CONTENT_TYPES: Dict[str, Dict[str, Any]] = {
     'real_estate': {
         'label': 'Propiedad / Real Estate',
         'icon': '🏠',
         'prompt_key': 'PROPERTY_EXTRACTION_PROMPT',  # Importado de prompts.py
-        'domains': [
+        'domains': (
             'brevitas.com',
             'coldwellbanker',
             'coldwellbankercostarica.com',
@@ -438,30 +430,30 @@ CONTENT_TYPES: Dict[str, Dict[str, Any]] = {
             'properati',
             'mercadolibre',
             'olx',
-        ],
-        'keywords': [
+        ),
+        'keywords': (
             'bedroom', 'bedrooms', 'habitaciones', 'recámaras',
             'bathroom', 'bathrooms', 'baños',
             'sqft', 'square feet', 'm2', 'm²', 'metros cuadrados',
             'property', 'propiedad', 'casa', 'house', 'apartment', 'apartamento',
             'for sale', 'venta', 'for rent', 'alquiler',
             'lot size', 'terreno', 'land',
-        ],
+        ),
         'description': 'Extrae información de propiedades inmobiliarias: precio, ubicación, características físicas, amenidades.',
     },
     'tour': {
         'label': 'Tour / Actividad',
         'icon': '🗺️',
         'prompt_key': 'TOUR_EXTRACTION_PROMPT',
-        'domains': [
+        'domains': (
             'viator.com',
             'getyourguide.com',
             'tripadvisor',
             'airbnbexperiences',
             'klook.com',
             'costarica.org',  # Costa Rica official tourism
-        ],
-        'keywords': [
+        ),
+        'keywords': (
             'tour', 'tours', 'excursion', 'excursiones', 'excursions',
             'activity', 'activities', 'actividades',
             'adventure', 'adventures', 'aventura',
@@ -476,21 +468,21 @@ CONTENT_TYPES: Dict[str, Dict[str, Any]] = {
             'itinerary', 'itinerario',
             'wildlife', 'nature', 'naturaleza',
             'zip line', 'canopy', 'rafting', 'hiking',
-        ],
+        ),
         'description': 'Extrae información de tours y actividades: tipo, duración, precio, qué incluye, nivel de dificultad.',
     },
     'restaurant': {
         'label': 'Restaurante / Comida',
         'icon': '🍴',
         'prompt_key': 'RESTAURANT_EXTRACTION_PROMPT',
-        'domains': [
+        'domains': (
             'yelp.com',
             'zomato.com',
             'opentable.com',
             'tripadvisor',
             'happycow.net',
-        ],
-        'keywords': [
+        ),
+        'keywords': (
             'restaurant', 'restaurante',
             'menu', 'menú',
             'cuisine', 'cocina',
@@ -500,20 +492,20 @@ CONTENT_TYPES: Dict[str, Dict[str, Any]] = {
             'chef',
             'hours', 'horario',
             'price range', 'rango de precio',
-        ],
+        ),
         'description': 'Extrae información de restaurantes: tipo de cocina, rango de precios, platillos destacados, horarios.',
     },
     'local_tips': {
         'label': 'Tips Locales / Consejos',
         'icon': '💡',
         'prompt_key': 'LOCAL_TIPS_EXTRACTION_PROMPT',
-        'domains': [
+        'domains': (
             'wikivoyage',
             'lonelyplanet',
             'nomadicmatt',
             'reddit.com/r/travel',
-        ],
-        'keywords': [
+        ),
+        'keywords': (
             'tip', 'tips', 'consejos',
             'advice', 'recomendación',
             'local', 'locals',
@@ -523,20 +515,20 @@ CONTENT_TYPES: Dict[str, Dict[str, Any]] = {
             'budget', 'presupuesto',
             'money', 'dinero',
             'customs', 'costumbres',
-        ],
+        ),
         'description': 'Extrae consejos prácticos: seguridad, costos, qué evitar, costumbres locales.',
     },
     'transportation': {
         'label': 'Transporte',
         'icon': '🚗',
         'prompt_key': 'TRANSPORTATION_EXTRACTION_PROMPT',
-        'domains': [
+        'domains': (
             'rome2rio',
             'uber.com',
             'lyft.com',
             'bus.com',
-        ],
-        'keywords': [
+        ),
+        'keywords': (
             'transport', 'transporte', 'transportation',
             'bus', 'taxi', 'shuttle',
             'route', 'ruta',
@@ -546,50 +538,168 @@ CONTENT_TYPES: Dict[str, Dict[str, Any]] = {
             'pickup', 'recogida',
             'dropoff', 'destino',
             'rental', 'alquiler',
-        ],
+        ),
         'description': 'Extrae información de transporte: rutas, costos, horarios, opciones disponibles.',
     },
 }
 
+# Read-only view: keyword/domain collections are tuples and the mappings
+# can't be mutated, so forked workers keep sharing these pages
+CONTENT_TYPES: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    key: MappingProxyType(config) for key, config in _CONTENT_TYPES.items()
+})
+
+
+# ============================================================================
+# FLATTENED LOOKUP TABLES
+# ============================================================================
+# CONTENT_TYPES as parallel tuples (same index = same content type, in
+# priority order), built once at import. Keywords and domains are lowercased
+# and flattened; *_OWNER[i] is the content-type index of the i-th entry.
+
+TYPE_KEYS = tuple(CONTENT_TYPES)
+TYPE_INDEX = {key: index for index, key in enumerate(TYPE_KEYS)}
+_LABELS = tuple(CONTENT_TYPES[key]['label'] for key in TYPE_KEYS)
+_ICONS = tuple(CONTENT_TYPES[key]['icon'] for key in TYPE_KEYS)
+_DESCRIPTIONS = tuple(CONTENT_TYPES[key]['description'] for key in TYPE_KEYS)
+_PROMPT_KEYS = tuple(CONTENT_TYPES[key]['prompt_key'] for key in TYPE_KEYS)
+
+KEYWORDS_FLAT = tuple(
+    keyword.lower() for key in TYPE_KEYS for keyword in CONTENT_TYPES[key]['keywords']
+)
+KEYWORD_OWNER = tuple(
+    index for index, key in enumerate(TYPE_KEYS) for _ in CONTENT_TYPES[key]['keywords']
+)
+KEYWORD_TOTALS = tuple(len(CONTENT_TYPES[key]['keywords']) for key in TYPE_KEYS)
+
+DOMAINS_FLAT = tuple(
+    domain.lower() for key in TYPE_KEYS for domain in CONTENT_TYPES[key]['domains']
+)
+DOMAIN_OWNER = tuple(
+    index for index, key in enumerate(TYPE_KEYS) for _ in CONTENT_TYPES[key]['domains']
+)
+
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def get_content_type_config(content_type: str) -> Dict[str, Any]:
+def get_content_type_config(content_type: str) -> Mapping[str, Any]:
     """Get configuration for a specific content type."""
-    if content_type not in CONTENT_TYPES:
+    if content_type not in TYPE_INDEX:
         raise ValueError(f"Unknown content type: {content_type}. Available: {list(CONTENT_TYPES.keys())}")
     return CONTENT_TYPES[content_type]
 
 
-def get_extraction_prompt(content_type: str, page_type: str = 'specific') -> str:
+# Map prompt keys to (specific, general) prompts
+# For real_estate and tour: page_type chooses specific vs general prompt
+_PROMPTS_BY_KEY: Dict[str, Tuple[str, str]] = {
+    'PROPERTY_EXTRACTION_PROMPT': (PROPERTY_EXTRACTION_PROMPT, REAL_ESTATE_GUIDE_EXTRACTION_PROMPT),
+    'TOUR_EXTRACTION_PROMPT': (TOUR_EXTRACTION_PROMPT, TOUR_GUIDE_EXTRACTION_PROMPT),
+    'RESTAURANT_EXTRACTION_PROMPT': (RESTAURANT_EXTRACTION_PROMPT, RESTAURANT_EXTRACTION_PROMPT),
+    'LOCAL_TIPS_EXTRACTION_PROMPT': (LOCAL_TIPS_EXTRACTION_PROMPT, LOCAL_TIPS_EXTRACTION_PROMPT),
+    'TRANSPORTATION_EXTRACTION_PROMPT': (TRANSPORTATION_EXTRACTION_PROMPT, TRANSPORTATION_EXTRACTION_PROMPT),
+}
+
+# Lean variants drop the per-field "*_evidence" quotes and the
+# confidence_reasoning field from the output schema. Those fields roughly
+# double the completion tokens, and callers that only need the values can
+# skip them (field_confidence then comes back empty).
+_EVIDENCE_LINE_RE = re.compile(r'^\s*"(?:[a-z_]*_evidence|confidence_reasoning)":.*\n', re.MULTILINE)
+_EVIDENCE_INSTRUCTION_RE = re.compile(r'^(\d+\. ).*(?:include an "evidence"|incluye "evidence").*$', re.MULTILINE)
+# Prose sentences asking for something to be noted in "confidence_reasoning"
+_EVIDENCE_SENTENCE_RE = re.compile(r' ?[^.\n*]*"confidence_reasoning"[^\n]*?\.')
+_DANGLING_COMMA_RE = re.compile(r',(\s*\n\s*(?:\}\}|\]))')
+
+
+def _strip_evidence(prompt: str) -> str:
+    """Derive the lean (no evidence fields) variant of an extraction prompt."""
+    prompt = _EVIDENCE_INSTRUCTION_RE.sub(r'\1Do NOT include evidence or confidence_reasoning fields', prompt)
+    prompt = _EVIDENCE_LINE_RE.sub('', prompt)
+    prompt = _EVIDENCE_SENTENCE_RE.sub('', prompt)
+    return _DANGLING_COMMA_RE.sub(r'\1', prompt)
+
+
+# (content_type, page_type, include_evidence) -> prompt, and the same prompt
+# split once around its {content} placeholder
+_PROMPT_TABLE: Dict[Tuple[str, str, bool], str] = {
+    (key, page_type, include_evidence): (
+        prompt if include_evidence else _strip_evidence(prompt)
+    )
+    for index, key in enumerate(TYPE_KEYS)
+    for page_type in ('specific', 'general')
+    for prompt in (_PROMPTS_BY_KEY[_PROMPT_KEYS[index]][page_type == 'general'],)
+    for include_evidence in (True, False)
+}
+
+_PROMPT_PARTS_TABLE: Dict[Tuple[str, str, bool], Tuple[str, str]] = {
+    table_key: (prefix, suffix)
+    for table_key, (prefix, _, suffix) in (
+        (table_key, prompt.partition('{content}')) for table_key, prompt in _PROMPT_TABLE.items()
+    )
+}
+
+
+def _prompt_table_key(content_type: str, page_type: str, include_evidence: bool) -> Tuple[str, str, bool]:
+    # Anything other than 'specific' selects the general (guide) prompt
+    return (content_type, 'specific' if page_type == 'specific' else 'general', bool(include_evidence))
+
+
+def get_extraction_prompt(
+    content_type: str,
+    page_type: str = 'specific',
+    include_evidence: bool = True
+) -> str:
     """
     Get the extraction prompt for a content type and page type.
     
     Args:
         content_type: Type of content (tour, restaurant, real_estate, etc.)
         page_type: 'specific' (single item) or 'general' (guide/listing)
+        include_evidence: False selects the lean prompt without evidence fields
     
     Returns:
         Appropriate extraction prompt
     """
-    from .prompts import PROPERTY_EXTRACTION_PROMPT
-    
-    config = get_content_type_config(content_type)
-    prompt_key = config['prompt_key']
+    try:
+        return _PROMPT_TABLE[_prompt_table_key(content_type, page_type, include_evidence)]
+    except KeyError:
+        get_content_type_config(content_type)  # raises ValueError
+        raise
+
+
+def get_extraction_prompt_parts(
+    content_type: str,
+    page_type: str = 'specific',
+    include_evidence: bool = True
+) -> Tuple[str, str]:
+    """
+    Get the extraction prompt split around its {content} placeholder.
     
-    # Map prompt keys to actual prompts
-    # For real_estate and tour: check page_type to choose specific vs general prompt
-    prompts = {
-        'PROPERTY_EXTRACTION_PROMPT': PROPERTY_EXTRACTION_PROMPT if page_type == 'specific' else REAL_ESTATE_GUIDE_EXTRACTION_PROMPT,
-        'TOUR_EXTRACTION_PROMPT': TOUR_EXTRACTION_PROMPT if page_type == 'specific' else TOUR_GUIDE_EXTRACTION_PROMPT,
-        'RESTAURANT_EXTRACTION_PROMPT': RESTAURANT_EXTRACTION_PROMPT,
-        'LOCAL_TIPS_EXTRACTION_PROMPT': LOCAL_TIPS_EXTRACTION_PROMPT,
-        'TRANSPORTATION_EXTRACTION_PROMPT': TRANSPORTATION_EXTRACTION_PROMPT,
-    }
+    Returns:
+        (prefix, suffix) tuple, precomputed at import
+    """
+    try:
+        return _PROMPT_PARTS_TABLE[_prompt_table_key(content_type, page_type, include_evidence)]
+    except KeyError:
+        get_content_type_config(content_type)  # raises ValueError
+        raise
+
+
+def render_extraction_prompt(
+    content_type: str,
+    page_type: str,
+    content: str,
+    include_evidence: bool = True
+) -> str:
+    """
+    Build the extraction prompt for the given content.
     
-    return prompts[prompt_key]
+    Equivalent to get_extraction_prompt(...).replace('{content}', content),
+    without scanning the template on every call.
+    """
+    prefix, suffix = get_extraction_prompt_parts(content_type, page_type, include_evidence)
+    return ''.join((prefix, content, suffix))
 
 
 def get_all_content_types() -> List[Dict[str, str]]:
@@ -597,9 +707,9 @@ def get_all_content_types() -> List[Dict[str, str]]:
     return [
         {
             'key': key,
-            'label': config['label'],
-            'icon': config['icon'],
-            'description': config['description'],
+            'label': _LABELS[index],
+            'icon': _ICONS[index],
+            'description': _DESCRIPTIONS[index],
         }
-        for key, config in CONTENT_TYPES.items()
+        for index, key in enumerate(TYPE_KEYS)
     ]
@@ -0,0 +1,103 @@
+"""
+Content-hash keyed cache for embedding vectors.
+
+Embeddings are deterministic for a given (model, text) pair, so vectors are
+stored under a sha256 of both and never expire. Vectors are packed as
+float32 bytes, which is about half the size of a pickled list of floats.
+"""
+
+import hashlib
+import logging
+from typing import Callable, List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+def _get_model(model: Optional[str]) -> str:
+    return model or getattr(settings, 'OPENAI_EMBEDDING_MODEL', 'text-embedding-3-small')
+
+
+def embedding_cache_key(text: str, model: str) -> str:
+    """Build the cache key for a (model, text) pair."""
+    digest = hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+    return f"embv:{digest}"
+
+
+def _pack(vector: List[float]) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def _unpack(data: bytes) -> List[float]:
+    return np.frombuffer(data, dtype=np.float32).tolist()
+
+
+def get_or_compute(
+    text: str,
+    compute: Callable[[str], Optional[List[float]]],
+    model: str = None
+) -> Optional[List[float]]:
+    """
+    Return the cached embedding for text, calling compute(text) on a miss.
+
+    Args:
+        text: Text to embed
+        compute: Function that calls the embeddings API for a single text
+        model: Embedding model name (defaults to OPENAI_EMBEDDING_MODEL)
+
+    Returns:
+        Embedding vector, or None if compute failed
+    """
+    cache = caches['embeddings']
+    key = embedding_cache_key(text, _get_model(model))
+
+    cached = cache.get(key)
+    if cached is not None:
+        logger.debug("Embedding cache hit")
+        return _unpack(cached)
+
+    vector = compute(text)
+    if vector is not None:
+        cache.set(key, _pack(vector), timeout=None)
+
+    return vector
+
+
+def get_or_compute_many(
+    texts: List[str],
+    compute_many: Callable[[List[str]], List[Optional[List[float]]]],
+    model: str = None
+) -> List[Optional[List[float]]]:
+    """
+    Batch version of get_or_compute.
+
+    Only the texts missing from the cache are passed to compute_many, in a
+    single call. Results are returned in the same order as texts.
+    """
+    if not texts:
+        return []
+
+    cache = caches['embeddings']
+    model = _get_model(model)
+    keys = [embedding_cache_key(text, model) for text in texts]
+
+    cached = cache.get_many(keys)
+    results = [_unpack(cached[key]) if key in cached else None for key in keys]
+
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if missing:
+        vectors = compute_many([texts[i] for i in missing])
+        to_store = {}
+        for i, vector in zip(missing, vectors):
+            results[i] = vector
+            if vector is not None:
+                to_store[keys[i]] = _pack(vector)
+        if to_store:
+            cache.set_many(to_store, timeout=None)
+
+    logger.info(f"Embedding cache: {len(texts) - len(missing)}/{len(texts)} hits")
+
+    return results
@@ -8,6 +8,9 @@ from typing import List, Optional
 import openai
 from django.conf import settings
 
+from .clients import get_openai_client
+from .embedding_cache import get_or_compute
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,7 +34,7 @@ def generate_embedding(text: str) -> Optional[List[float]]:
             logger.error("OPENAI_API_KEY not configured")
             return None
         
-        client = openai.OpenAI(api_key=api_key)
+        client = get_openai_client()
         
         # Get embedding model from settings (default to text-embedding-3-small)
         model = getattr(settings, 'OPENAI_EMBEDDING_MODEL', 'text-embedding-3-small')
@@ -44,14 +47,15 @@ def generate_embedding(text: str) -> Optional[List[float]]:
             logger.warning(f"Text too long ({len(text)} chars), truncating to 32,000")
             text = text[:32000]
         
-        # Call OpenAI API
-        response = client.embeddings.create(
-            model=model,
-            input=text
-        )
+        # Call OpenAI API (unless this exact text was embedded before)
+        def _call_api(text):
+            response = client.embeddings.create(
+                model=model,
+                input=text
+            )
+            return response.data[0].embedding
         
-        # Extract embedding vector
-        embedding = response.data[0].embedding
+        embedding = get_or_compute(text, _call_api, model=model)
         
         logger.info(f"✓ Embedding generated successfully (dimension: {len(embedding)})")
         
@@ -151,7 +155,7 @@ def batch_generate_embeddings(texts: List[str], model: str = None) -> List[Optio
             logger.error("OPENAI_API_KEY not configured")
             return [None] * len(texts)
         
-        client = openai.OpenAI(api_key=api_key)
+        client = get_openai_client()
         
         if not model:
             model = getattr(settings, 'OPENAI_EMBEDDING_MODEL', 'text-embedding-3-small')
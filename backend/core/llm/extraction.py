@@ -2,6 +2,7 @@
 LLM-powered property extraction from HTML/text.
 """
 
+import hashlib
 import json
 import logging
 from typing import Dict, Optional
@@ -9,14 +10,90 @@ from decimal import Decimal
 
 import openai
 from django.conf import settings
+from django.core.cache import caches
 from django.utils import timezone
 
+from . import json_utils
+from .clients import get_openai_client
 from .prompts import PROPERTY_EXTRACTION_PROMPT
-from .content_types import get_extraction_prompt, CONTENT_TYPES
+from .content_types import render_extraction_prompt, CONTENT_TYPES
 
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# VALIDATION FIELD TABLES
+# ============================================================================
+# Built once at import instead of on every _validate_extraction call
+
+# Guide fields copied as-is for GENERAL pages
+GUIDE_FIELDS = (
+    'page_type', 'destination', 'overview',
+    'property_types_available', 'tour_types_available',
+    'price_range', 'popular_areas', 'market_trends',
+    'featured_properties', 'featured_tours', 'featured_items_count',
+    'total_properties_mentioned', 'total_tours_mentioned',
+    'investment_tips', 'booking_tips', 'legal_considerations',
+    'best_season', 'best_time_of_day', 'duration_range',
+    'tips', 'things_to_bring', 'cuisine_types',
+    # NEW: Extended tour guide fields
+    'regions', 'seasonal_activities', 'faqs', 'what_to_pack',
+    'family_friendly', 'accessibility_info',
+)
+
+# Content-specific field -> generic Property field it is copied to
+FIELD_MAPPING = {
+    'tour': {
+        'tour_name': 'property_name',
+        'tour_type': 'property_type',
+    },
+    'restaurant': {
+        'restaurant_name': 'property_name',
+        'cuisine_type': 'property_type',
+    },
+    'real_estate': {
+        # Real estate uses property_name/property_type directly (no mapping needed)
+    },
+    'local_tips': {
+        'tip_title': 'property_name',
+        'tip_category': 'property_type',
+    },
+    'transportation': {
+        'service_name': 'property_name',
+        'transport_type': 'property_type',
+    }
+}
+
+INTEGER_FIELDS = ('bedrooms', 'year_built', 'parking_spaces')
+DECIMAL_FIELDS = (
+    'bathrooms', 'square_meters', 'lot_size_m2',
+    'hoa_fee_monthly', 'property_tax_annual', 'latitude', 'longitude',
+)
+
+GENERIC_FIELDS = (
+    'property_name', 'property_type', 'location', 'description',
+    'listing_id', 'internal_property_id', 'listing_status',
+)
+
+# Content-specific fields by type
+CONTENT_SPECIFIC_FIELDS = {
+    'tour': ('tour_name', 'tour_type', 'duration_hours', 'difficulty_level',
+             'included_items', 'excluded_items', 'max_participants',
+             'languages_available', 'pickup_included', 'minimum_age',
+             'cancellation_policy', 'schedules', 'what_to_bring',
+             'check_in_time', 'restrictions'),
+    'restaurant': ('restaurant_name', 'cuisine_type', 'opening_hours',
+                   'price_range', 'dress_code', 'reservation_required'),
+    'real_estate': ('property_name', 'property_type'),
+}
+
+# Fields copied as-is, per content type (generic + content-specific)
+PASSTHROUGH_FIELDS = {
+    content_type: GENERIC_FIELDS + CONTENT_SPECIFIC_FIELDS.get(content_type, ())
+    for content_type in CONTENT_TYPES
+}
+
+
 class ExtractionError(Exception):
     """Base exception for extraction errors."""
     pass
@@ -28,13 +105,20 @@ class PropertyExtractor:
     Supports multiple content types: real_estate, tour, restaurant, local_tips, transportation.
     """
     
-    def __init__(self, content_type: str = 'real_estate', page_type: str = 'specific'):
+    def __init__(
+        self,
+        content_type: str = 'real_estate',
+        page_type: str = 'specific',
+        include_evidence: bool = True
+    ):
         """
         Initialize extractor.
         
         Args:
             content_type: Type of content to extract (real_estate, tour, restaurant, etc.)
             page_type: Type of page ('specific' for single item, 'general' for guides/listings)
+            include_evidence: Ask the LLM for per-field evidence quotes. False uses
+                a lean prompt with a much smaller output (field_confidence will be empty)
         """
         api_key = settings.OPENAI_API_KEY
         logger.info(f"🔑 OPENAI_API_KEY configured: {'Yes' if api_key else 'No'}")
@@ -57,7 +141,9 @@ class PropertyExtractor:
         
         self.content_type = content_type
         self.page_type = page_type
-        self.client = openai.OpenAI(api_key=api_key)
+        self.include_evidence = include_evidence
+        # Shared process-wide client: reuses its connection pool across extractors
+        self.client = get_openai_client()
         self.model = settings.OPENAI_MODEL_CHAT
         self.max_tokens = settings.OPENAI_MAX_TOKENS
         self.temperature = 0.1  # Low temperature for consistent extraction
@@ -68,8 +154,8 @@ class PropertyExtractor:
         """Clean and truncate content for LLM processing."""
         from bs4 import BeautifulSoup
         
-        # Parse HTML
-        soup = BeautifulSoup(content, 'html.parser')
+        # Parse HTML (lxml's C parser; much faster than html.parser on full pages)
+        soup = BeautifulSoup(content, 'lxml')
         
         # Extract key sections
         important_text = []
@@ -323,7 +409,7 @@ Now infer the missing fields:"""
             )
             
             inferred_json = response.choices[0].message.content
-            inferred_data = json.loads(inferred_json)
+            inferred_data = json_utils.loads(inferred_json)
             
             logger.info(f"✅ Inferred {len(inferred_data)} fields")
             logger.info(f"Inferred data: {json.dumps(inferred_data, indent=2, default=str)[:500]}")
@@ -378,7 +464,7 @@ Return ONLY JSON with values or nulls for missing fields."""
                             response_format={"type": "json_object"}
                         )
                         
-                        third_pass_data = json.loads(response3.choices[0].message.content)
+                        third_pass_data = json_utils.loads(response3.choices[0].message.content)
                         data['tokens_used'] = data.get('tokens_used', 0) + response3.usage.total_tokens
                         
                         third_filled = 0
@@ -405,21 +491,7 @@ Return ONLY JSON with values or nulls for missing fields."""
         # For GENERAL pages, preserve guide fields without strict validation
         if self.page_type == 'general':
             # Copy all guide-specific fields directly
-            guide_fields = [
-                'page_type', 'destination', 'overview', 
-                'property_types_available', 'tour_types_available',
-                'price_range', 'popular_areas', 'market_trends',
-                'featured_properties', 'featured_tours', 'featured_items_count',
-                'total_properties_mentioned', 'total_tours_mentioned',
-                'investment_tips', 'booking_tips', 'legal_considerations',
-                'best_season', 'best_time_of_day', 'duration_range',
-                'tips', 'things_to_bring', 'cuisine_types',
-                # NEW: Extended tour guide fields
-                'regions', 'seasonal_activities', 'faqs', 'what_to_pack',
-                'family_friendly', 'accessibility_info'
-            ]
-            
-            for field in guide_fields:
+            for field in GUIDE_FIELDS:
                 if field in data:
                     validated[field] = data[field]
         
@@ -433,30 +505,8 @@ Return ONLY JSON with values or nulls for missing fields."""
         # This allows frontend to display context-appropriate labels while
         # maintaining backward compatibility with Property model.
         
-        field_mapping = {
-            'tour': {
-                'tour_name': 'property_name',
-                'tour_type': 'property_type',
-            },
-            'restaurant': {
-                'restaurant_name': 'property_name',
-                'cuisine_type': 'property_type',
-            },
-            'real_estate': {
-                # Real estate uses property_name/property_type directly (no mapping needed)
-            },
-            'local_tips': {
-                'tip_title': 'property_name',
-                'tip_category': 'property_type',
-            },
-            'transportation': {
-                'service_name': 'property_name',
-                'transport_type': 'property_type',
-            }
-        }
-        
         # Apply content-type specific mapping (CREATE copies, don't replace)
-        content_mapping = field_mapping.get(self.content_type, {})
+        content_mapping = FIELD_MAPPING.get(self.content_type, {})
         for source_field, target_field in content_mapping.items():
             if source_field in data and data[source_field] not in [None, '']:
                 # Copy source to target (keep both fields)
@@ -481,7 +531,7 @@ Return ONLY JSON with values or nulls for missing fields."""
                 validated['price_details'] = {}
         
         # Handle integers
-        for field in ['bedrooms', 'year_built', 'parking_spaces']:
+        for field in INTEGER_FIELDS:
             if data.get(field):
                 try:
                     validated[field] = int(data[field])
@@ -489,8 +539,7 @@ Return ONLY JSON with values or nulls for missing fields."""
                     validated[field] = None
         
         # Handle decimals
-        for field in ['bathrooms', 'square_meters', 'lot_size_m2', 
-                     'hoa_fee_monthly', 'property_tax_annual', 'latitude', 'longitude']:
+        for field in DECIMAL_FIELDS:
             if data.get(field):
                 try:
                     validated[field] = Decimal(str(data[field]))
@@ -498,25 +547,7 @@ Return ONLY JSON with values or nulls for missing fields."""
                     validated[field] = None
         
         # Handle strings - BOTH generic and content-specific fields
-        generic_fields = ['property_name', 'property_type', 'location', 'description',
-                         'listing_id', 'internal_property_id', 'listing_status']
-        
-        # Content-specific fields by type
-        content_specific_fields = {
-            'tour': ['tour_name', 'tour_type', 'duration_hours', 'difficulty_level',
-                    'included_items', 'excluded_items', 'max_participants', 
-                    'languages_available', 'pickup_included', 'minimum_age',
-                    'cancellation_policy', 'schedules', 'what_to_bring',
-                    'check_in_time', 'restrictions'],
-            'restaurant': ['restaurant_name', 'cuisine_type', 'opening_hours',
-                          'price_range', 'dress_code', 'reservation_required'],
-            'real_estate': ['property_name', 'property_type'],
-        }
-        
-        # Add content-specific fields for this content type
-        all_fields = generic_fields + content_specific_fields.get(self.content_type, [])
-        
-        for field in all_fields:
+        for field in PASSTHROUGH_FIELDS.get(self.content_type, GENERIC_FIELDS):
             if field in data:
                 validated[field] = data.get(field)
         
@@ -552,6 +583,31 @@ Return ONLY JSON with values or nulls for missing fields."""
         
         return validated
     
+    @staticmethod
+    def _result_cache():
+        """On-disk exact-match cache for extraction results (None if disabled)."""
+        return caches['extractions'] if settings.LLM_CACHE_ENABLED else None
+    
+    def _result_cache_key(self, content: str) -> str:
+        """Cache key for an extraction of this cleaned content with this prompt/model."""
+        digest = hashlib.blake2b(digest_size=20)
+        lean = '' if self.include_evidence else 'lean'
+        for part in (self.content_type, self.page_type, lean, self.model, content):
+            digest.update(part.encode())
+            digest.update(b'|')
+        return f"extract:{digest.hexdigest()}"
+    
+    @staticmethod
+    def _cached_prompt_tokens(usage) -> int:
+        """
+        Prompt tokens served from OpenAI's automatic prompt cache.
+        
+        Prompts put the static instructions first and the page content
+        last, so repeat calls with the same prompt share a cached prefix.
+        """
+        details = getattr(usage, 'prompt_tokens_details', None)
+        return getattr(details, 'cached_tokens', None) or 0
+    
     def extract_from_html(self, html: str, url: Optional[str] = None) -> Dict:
         """
         Extract data from HTML content based on content type.
@@ -570,10 +626,22 @@ Return ONLY JSON with values or nulls for missing fields."""
         # Clean content
         content = self._clean_content(html)
         
+        # Re-scraping an unchanged page produces identical cleaned content;
+        # reuse the earlier extraction instead of repeating the LLM passes
+        cache = self._result_cache()
+        cache_key = self._result_cache_key(content)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info("♻️ Extraction cache hit, skipping LLM call")
+                return self._add_metadata(dict(cached), url, html, tokens_used=0)
+            logger.info("Extraction cache miss")
+        
         # Get the appropriate prompt for this content type and page type
-        extraction_prompt_template = get_extraction_prompt(self.content_type, self.page_type)
-        # Use replace instead of format to avoid issues with braces in HTML content
-        prompt = extraction_prompt_template.replace('{content}', content)
+        # (content is spliced in, not formatted, so braces in HTML are safe)
+        prompt = render_extraction_prompt(
+            self.content_type, self.page_type, content, include_evidence=self.include_evidence
+        )
         
         logger.info(f"Prompt preview (first 800 chars): {prompt[:800]}")
         logger.info(f"Prompt preview (last 800 chars): {prompt[-800:]}")
@@ -595,12 +663,15 @@ Return ONLY JSON with values or nulls for missing fields."""
             # Extract JSON from response
             raw_json = response.choices[0].message.content
             
-            logger.info(f"LLM extraction completed. Tokens used: {response.usage.total_tokens}")
+            logger.info(
+                f"LLM extraction completed. Tokens used: {response.usage.total_tokens} "
+                f"({self._cached_prompt_tokens(response.usage)} prompt tokens cached)"
+            )
             logger.info(f"Raw LLM response: {raw_json[:500]}")  # Log first 500 chars
             
             # Parse JSON
             try:
-                extracted_data = json.loads(raw_json)
+                extracted_data = json_utils.loads(raw_json)
                 logger.info(f"Parsed JSON keys: {list(extracted_data.keys())}")
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse LLM JSON response: {e}")
@@ -621,12 +692,13 @@ Return ONLY JSON with values or nulls for missing fields."""
                 html
             )
             
+            if cache is not None:
+                cache.set(cache_key, validated_data, timeout=settings.LLM_CACHE_TTL_HOURS * 3600)
+            
             # Add metadata
-            validated_data['source_url'] = url
-            validated_data['raw_html'] = html[:10000]  # Store first 10K chars
-            validated_data['tokens_used'] = response.usage.total_tokens
-            validated_data['content_type'] = self.content_type
-            validated_data['page_type'] = self.page_type
+            validated_data = self._add_metadata(
+                dict(validated_data), url, html, tokens_used=response.usage.total_tokens
+            )
             
             logger.info(f"Extraction successful. Confidence: {validated_data['extraction_confidence']}")
             
@@ -640,6 +712,21 @@ Return ONLY JSON with values or nulls for missing fields."""
             logger.error(f"Unexpected extraction error: {e}")
             raise ExtractionError(f"Extraction failed: {str(e)}")
     
+    def _add_metadata(self, data: Dict, url: Optional[str], html: str, tokens_used: int) -> Dict:
+        """
+        Attach per-request metadata to an extraction result.
+        
+        Also stamps extracted_at, so results served from the extraction
+        cache carry the time of this request, not of the original extraction.
+        """
+        data['source_url'] = url
+        data['raw_html'] = html[:10000]  # Store first 10K chars
+        data['tokens_used'] = tokens_used
+        data['content_type'] = self.content_type
+        data['page_type'] = self.page_type
+        data['extracted_at'] = timezone.now()
+        return data
+    
     def extract_from_text(self, text: str) -> Dict:
         """
         Extract property data from plain text.
@@ -696,7 +783,13 @@ def extract_property_data(content: str, url: Optional[str] = None) -> Dict:
     return extractor.extract_from_html(content, url=url)
 
 
-def extract_content_data(content: str, content_type: str, page_type: str = 'specific', url: Optional[str] = None) -> Dict:
+def extract_content_data(
+    content: str,
+    content_type: str,
+    page_type: str = 'specific',
+    url: Optional[str] = None,
+    include_evidence: bool = True
+) -> Dict:
     """
     Generic function to extract data for any content type.
     
@@ -705,6 +798,7 @@ def extract_content_data(content: str, content_type: str, page_type: str = 'spec
         content_type: Type of content (real_estate, tour, restaurant, local_tips, transportation)
         page_type: Type of page ('specific' for single item details, 'general' for guides/listings)
         url: Optional source URL
+        include_evidence: Set False to skip the per-field evidence quotes (cheaper, faster)
         
     Returns:
         Dictionary with extracted data (fields depend on content_type and page_type)
@@ -719,5 +813,7 @@ def extract_content_data(content: str, content_type: str, page_type: str = 'spec
         # Extract restaurant data  
         data = extract_content_data(html, 'restaurant', 'specific', url='https://yelp.com/biz/...')
     """
-    extractor = PropertyExtractor(content_type=content_type, page_type=page_type)
+    extractor = PropertyExtractor(
+        content_type=content_type, page_type=page_type, include_evidence=include_evidence
+    )
     return extractor.extract_from_html(content, url=url)
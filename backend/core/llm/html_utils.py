@@ -0,0 +1,33 @@
+"""
+Shared HTML parsing for the detectors.
+
+Content type detection, page type detection and the OpenAI preview all
+start from the same scraped page. parse_visible_tree parses it once with
+lxml (scripts, styles and comments removed) and memoizes the tree, so the
+detectors run over one parse instead of one each.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from lxml import etree
+import lxml.html
+
+
+@lru_cache(maxsize=16)
+def parse_visible_tree(html: str) -> Optional[etree._Element]:
+    """
+    Parse html into an lxml tree without script, style and comment nodes.
+
+    The tree is shared between callers: treat it as read-only, or
+    copy.deepcopy it before modifying.
+
+    Returns:
+        Root element, or None if lxml refuses the document (e.g. empty)
+    """
+    try:
+        tree = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+    etree.strip_elements(tree, 'script', 'style', etree.Comment, with_tail=False)
+    return tree
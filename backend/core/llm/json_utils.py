@@ -0,0 +1,41 @@
+"""
+Fast JSON parsing for LLM responses (and serialization of results).
+
+Uses orjson when installed and falls back to the standard library.
+orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+keep catching the stdlib exception either way.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document from str or bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes.
+    
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation
+        default: Called for objects JSON can't encode natively (e.g. str)
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=default, ensure_ascii=False).encode()
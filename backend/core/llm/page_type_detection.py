@@ -13,40 +13,75 @@ Expected distribution:
 - 2% would need Level 3 (skip for MVP)
 """
 
+import copy
+import hashlib
 import logging
 import re
-from typing import Dict, Optional
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
+from lxml import etree
+import lxml.html
+from django.conf import settings
+from django.core.cache import caches
+
+from . import json_utils
+from .clients import get_openai_client
+from .html_utils import parse_visible_tree
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+# Tags that don't help with classification, and the attributes worth keeping
+_ANALYSIS_DROP_TAGS = ('style', 'script', 'noscript', 'svg', 'path', 'iframe', 'link', 'meta')
+_ANALYSIS_KEEP_ATTRS = frozenset(('class', 'id', 'href', 'alt', 'title'))
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=16)
 def _clean_html_for_analysis(html: str) -> str:
     """
     Clean HTML for OpenAI analysis - remove CSS, JS, and unnecessary tags.
     Keeps only semantic content that's useful for classification.
     
     Reduces token usage by ~60% while preserving classification accuracy.
+    Copies the lxml tree shared with the other detectors instead of parsing
+    again; BeautifulSoup is only used for input lxml refuses. Memoized:
+    content type classification and page type detection run on the same
+    scraped page, so the second detector reuses the first result.
     """
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove tags that don't help with classification
-        for tag in soup(['style', 'script', 'noscript', 'svg', 'path', 'iframe', 'link', 'meta']):
-            tag.decompose()
-        
-        # Remove inline styles and unnecessary attributes
-        for tag in soup.find_all(True):
+        shared_tree = parse_visible_tree(html) if html else None
+        if shared_tree is not None:
+            tree = copy.deepcopy(shared_tree)
+            etree.strip_elements(tree, *_ANALYSIS_DROP_TAGS, with_tail=False)
+            
             # Keep only semantic attributes
-            keep_attrs = ['class', 'id', 'href', 'alt', 'title']
-            tag.attrs = {k: v for k, v in tag.attrs.items() if k in keep_attrs}
-        
-        # Convert back to string (preserves HTML structure but without CSS/JS)
-        cleaned = str(soup)
+            for element in tree.iter(etree.Element):
+                attrib = element.attrib
+                for name in [name for name in attrib if name not in _ANALYSIS_KEEP_ATTRS]:
+                    del attrib[name]
+            
+            # Serialize (preserves HTML structure but without CSS/JS)
+            cleaned = lxml.html.tostring(tree, encoding='unicode')
+        else:
+            soup = BeautifulSoup(html, 'html.parser')
+            for tag in soup(list(_ANALYSIS_DROP_TAGS)):
+                tag.decompose()
+            for tag in soup.find_all(True):
+                tag.attrs = {k: v for k, v in tag.attrs.items() if k in _ANALYSIS_KEEP_ATTRS}
+            cleaned = str(soup)
         
         # Remove excessive whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned)
         
         return cleaned
         
@@ -55,7 +90,22 @@ def _clean_html_for_analysis(html: str) -> str:
         return html
 
 
-def detect_page_type(url: str, html: Optional[str] = None, content_type: str = 'tour') -> Dict:
+# Characters of cleaned HTML sent to OpenAI (~3K tokens)
+_PREVIEW_CHARS = 12000
+
+
+def _html_preview(html: str) -> str:
+    """Cleaned HTML truncated to the preview OpenAI classifies."""
+    return _clean_html_for_analysis(html)[:_PREVIEW_CHARS]
+
+
+def detect_page_type(
+    url: str,
+    html: Optional[str] = None,
+    content_type: str = 'tour',
+    l1_short_circuit_threshold: Optional[float] = None,
+    l2_short_circuit_threshold: Optional[float] = None
+) -> Dict:
     """
     OpenAI-direct page type detection (Opción 1).
     
@@ -66,22 +116,38 @@ def detect_page_type(url: str, html: Optional[str] = None, content_type: str = '
         url: Page URL
         html: Optional HTML content (if already scraped)
         content_type: Type of content (tour, restaurant, real_estate, etc.)
+        l1_short_circuit_threshold: Optional opt-in fast path. When set, URL
+            pattern analysis runs first and its verdict is returned without
+            calling OpenAI if its confidence reaches this value (e.g. 0.85)
+        l2_short_circuit_threshold: Optional opt-in fast path. When set, HTML
+            structure analysis runs before OpenAI (after the verdict cache)
+            and its verdict is returned if its confidence reaches this value
+            (e.g. 0.8)
         
     Returns:
         {
             'page_type': 'specific' | 'general',
             'confidence': 0.0-1.0,
-            'method': 'openai_direct',
+            'method': 'openai_direct' | 'url_pattern' | 'html_structure',
             'indicators': [list of reasons],
             'cost': float (USD),
             'time': float (seconds)
         }
     """
-    logger.info("=" * 80)
-    logger.info("🤖 OpenAI-Direct Page Type Detection (Opción 1)")
-    logger.info(f"   URL: {url}")
-    logger.info(f"   Content type: {content_type}")
-    logger.info("=" * 80)
+    logger.info("🤖 OpenAI-direct page type detection: %s (content type: %s)", url, content_type)
+    
+    if l1_short_circuit_threshold is not None:
+        url_type, url_confidence, url_reason = _url_verdict(url)
+        if url_confidence >= l1_short_circuit_threshold:
+            logger.info("⚡ URL pattern verdict: %s (%s)", url_type, url_reason)
+            return {
+                'page_type': url_type,
+                'confidence': url_confidence,
+                'method': 'url_pattern',
+                'indicators': [f"URL: {url_reason}"],
+                'cost': 0.0,
+                'time': 0.0
+            }
     
     if not html:
         logger.warning("⚠️ No HTML provided, cannot analyze page")
@@ -94,19 +160,42 @@ def detect_page_type(url: str, html: Optional[str] = None, content_type: str = '
             'time': 0.1
         }
     
+    # Re-detecting a page OpenAI has already seen (same URL, content type and
+    # cleaned preview) reuses the earlier verdict. The on-disk cache survives
+    # restarts and works without Redis.
+    cache = caches['extractions'] if settings.LLM_CACHE_ENABLED else None
+    cache_key = _page_type_cache_key(url, _html_preview(html), content_type)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("♻️ Page type cache hit: %s", cached['page_type'])
+            return {**cached, 'cost': 0.0, 'time': 0.0}
+    
+    if l2_short_circuit_threshold is not None:
+        html_result = _analyze_html_structure(html, content_type)
+        if html_result['confidence'] >= l2_short_circuit_threshold:
+            logger.info("⚡ HTML structure verdict: %s (%s)", html_result['page_type'], html_result['reason'])
+            return {
+                'page_type': html_result['page_type'],
+                'confidence': html_result['confidence'],
+                'method': 'html_structure',
+                'indicators': [f"HTML: {html_result['reason']}"],
+                'cost': 0.0,
+                'time': 0.0
+            }
+    
     # Llamada directa a OpenAI - sin niveles intermedios
-    logger.info("🎯 Calling OpenAI GPT-4o-mini for classification...")
+    logger.debug("🎯 Calling OpenAI GPT-4o-mini for classification...")
     openai_result = _analyze_with_openai(url, html, content_type)
     
-    logger.info(f"✅ OpenAI Result:")
-    logger.info(f"   Page type: {openai_result['page_type']}")
-    logger.info(f"   Confidence: {openai_result['confidence']:.0%}")
-    logger.info(f"   Reason: {openai_result['reason']}")
-    logger.info(f"   Cost: ${openai_result['cost']:.4f}")
-    logger.info(f"   Time: {openai_result['time']:.2f}s")
-    logger.info("=" * 80)
+    logger.info(
+        "✅ OpenAI result: %s (confidence %.0f%%, cost $%.4f, %.2fs)",
+        openai_result['page_type'], openai_result['confidence'] * 100,
+        openai_result['cost'], openai_result['time']
+    )
+    logger.debug("   Reason: %s", openai_result['reason'])
     
-    return {
+    result = {
         'page_type': openai_result['page_type'],
         'confidence': openai_result['confidence'],
         'method': 'openai_direct',
@@ -114,6 +203,26 @@ def detect_page_type(url: str, html: Optional[str] = None, content_type: str = '
         'cost': openai_result['cost'],
         'time': openai_result['time']
     }
+    
+    # Failed analyses come back with cost 0 and are not worth keeping
+    if cache is not None and openai_result['cost']:
+        cache.set(cache_key, result, timeout=settings.LLM_CACHE_TTL_HOURS * 3600)
+    
+    return result
+
+
+def _page_type_cache_key(url: str, html_preview: str, content_type: str) -> str:
+    """
+    Cache key for a page type verdict.
+    
+    Built from exactly what the prompt contains, so pages that only differ
+    in stripped markup (scripts, styles, nonces) share a verdict.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (content_type, url or '', html_preview):
+        digest.update(part.encode())
+        digest.update(b'|')
+    return f"pagetype:{digest.hexdigest()}"
 
 
 # ============================================================================
@@ -130,135 +239,196 @@ def detect_page_type(url: str, html: Optional[str] = None, content_type: str = '
 # LEVEL 1: URL PATTERN ANALYSIS (NO USADO)
 # ============================================================================
 
+# URL patterns, compiled once. Each group is fused into a single regex of
+# ordered lookahead alternatives, so one match() call applies the checks in
+# priority order (first listed wins, not leftmost in the path) and
+# match.lastgroup names the pattern that fired.
+_SPECIFIC_URL_PATTERNS = (
+    ('viator', r'/d\d+-\d+'),
+    ('gyg', r'/t\d{4,}'),
+    ('digits5', r'-\d{5,}'),
+    ('listing', r'/listing-\d+'),
+    ('detail', r'/(?:tour|property|listing)-detail/'),
+    ('tripadvisor', r'/(?:attraction|restaurant).*review.*-d\d+'),
+    ('property', r'/property/[a-z0-9-]+$'),
+)
+_GENERAL_URL_PATTERNS = (
+    ('plural_end', r'/(?:tours|properties|restaurants|activities)/?$'),
+    # Category/destination page: last segment has no ID-like 4+ digit run
+    ('category', r'/(?:tours|properties|restaurants)/(?![^/]*\d{4})[^/]+/?$'),
+    ('search_browse', r'/(?:search|browse|results|category)'),
+)
+
+
+def _fuse_patterns(patterns) -> re.Pattern:
+    return re.compile(
+        '|'.join(f'(?=.*?(?P<{name}>{pattern}))' for name, pattern in patterns),
+        re.DOTALL
+    )
+
+
+_SPECIFIC_URL_RE = _fuse_patterns(_SPECIFIC_URL_PATTERNS)
+_GENERAL_URL_RE = _fuse_patterns(_GENERAL_URL_PATTERNS)
+
+# Host fragments of real estate sites whose pages are usually single listings
+_REAL_ESTATE_DOMAIN_HINTS = ('coldwell', 'brevitas', 'encuentra24', 'remax')
+
+# Homepage paths
+_HOMEPAGE_PATHS = frozenset(('/', '', '/index', '/index.html'))
+
+# Pattern name -> (page_type, confidence, reason)
+_URL_MATCH_TABLE = {
+    'viator': ('specific', 0.95, 'Viator-style ID (d742-12345)'),
+    'gyg': ('specific', 0.95, 'GetYourGuide-style ID (t12345)'),
+    'digits5': ('specific', 0.90, 'Contains 5+ digit ID'),
+    'listing': ('specific', 0.95, 'Listing with ID'),
+    'detail': ('specific', 0.95, 'Detail page path (/tour-detail/)'),
+    'tripadvisor': ('specific', 0.95, 'TripAdvisor specific review page'),
+    'property': ('specific', 0.85, 'Property with slug'),
+    'plural_end': ('general', 0.90, 'Ends in plural (listing page)'),
+    'category': ('general', 0.85, 'Category/destination page'),
+    'search_browse': ('general', 0.95, 'Search/browse page'),
+}
+
+
+def _url_match_verdict(match: re.Match) -> Tuple[str, float, str]:
+    logger.debug("✅ MATCH: %s", match.group(match.lastgroup))
+    return _URL_MATCH_TABLE[match.lastgroup]
+
+
 def _analyze_url_patterns(url: str, content_type: str) -> Dict:
     """Analyze URL structure for page type hints."""
-    
-    logger.info("\n" + "-" * 60)
-    logger.info("🔍 URL PATTERN ANALYSIS")
-    logger.info("-" * 60)
-    
+    page_type, confidence, reason = _url_verdict(url)
+    return {'page_type': page_type, 'confidence': confidence, 'reason': reason}
+
+
+def _url_verdict(url: str) -> Tuple[str, float, str]:
+    """(page_type, confidence, reason) for a URL, without building a dict."""
     if not url:
         logger.warning("⚠️ No URL provided")
-        return {'page_type': 'specific', 'confidence': 0.3, 'reason': 'No URL provided'}
+        return 'specific', 0.3, 'No URL provided'
     
     parsed = urlparse(url)
-    path = parsed.path.lower()
-    logger.info(f"Domain: {parsed.netloc}")
-    logger.info(f"Path: {path}")
+    return _url_pattern_verdict(parsed.path.lower(), parsed.netloc.lower())
+
+
+@lru_cache(maxsize=8192)
+def _url_pattern_verdict(path: str, domain: str) -> Tuple[str, float, str]:
+    """
+    URL pattern verdict for a lowercased (path, domain) pair.
+    
+    Depends only on the URL, so crawls of one site mostly hit the cache.
+    
+    Returns:
+        (page_type, confidence, reason) tuple
+    """
+    logger.debug("🔍 URL pattern analysis - domain: %s, path: %s", domain, path)
     
     # ========================================================================
     # SPECIFIC PAGE INDICATORS (High confidence)
     # ========================================================================
     
-    # Pattern 1: Contains numeric ID patterns
-    logger.info("\n🔎 Checking for SPECIFIC page indicators...")
-    
-    match = re.search(r'/d\d+-\d+', path)
-    if match:
-        logger.info(f"✅ MATCH: Viator-style ID found: {match.group()}")
-        return {'page_type': 'specific', 'confidence': 0.95, 'reason': 'Viator-style ID (d742-12345)'}
-    logger.info("   ❌ No Viator ID (d742-XXX)")
-    
-    match = re.search(r'/t\d{4,}', path)
-    if match:
-        logger.info(f"✅ MATCH: GetYourGuide ID found: {match.group()}")
-        return {'page_type': 'specific', 'confidence': 0.95, 'reason': 'GetYourGuide-style ID (t12345)'}
-    logger.info("   ❌ No GetYourGuide ID (tXXXX)")
-    
-    match = re.search(r'-\d{5,}', path)
+    # ID patterns, TripAdvisor review pages, property slugs
+    match = _SPECIFIC_URL_RE.match(path)
     if match:
-        logger.info(f"✅ MATCH: 5+ digit ID found: {match.group()}")
-        return {'page_type': 'specific', 'confidence': 0.90, 'reason': 'Contains 5+ digit ID'}
-    logger.info("   ❌ No 5+ digit ID")
-    
-    match = re.search(r'/listing-\d+', path)
-    if match:
-        logger.info(f"✅ MATCH: Listing with ID: {match.group()}")
-        return {'page_type': 'specific', 'confidence': 0.95, 'reason': 'Listing with ID'}
-    logger.info("   ❌ No listing-ID pattern")
-    
-    # Pattern 2: TripAdvisor specific patterns
-    if re.search(r'/(attraction|restaurant).*review.*-d\d+', path):
-        return {'page_type': 'specific', 'confidence': 0.95, 'reason': 'TripAdvisor specific review page'}
-    
-    # Pattern 3: Real estate specific property
-    if re.search(r'/property/[a-z0-9-]+$', path):
-        return {'page_type': 'specific', 'confidence': 0.85, 'reason': 'Property with slug'}
+        return _url_match_verdict(match)
+    logger.debug("   ❌ No ID, review or property-slug pattern")
     
     # Pattern 4: Deep path (3+ levels after domain)
-    path_depth = len([p for p in path.split('/') if p])
-    logger.info(f"\n📏 Path depth: {path_depth} levels")
+    segments = path.split('/')
+    path_depth = len(segments) - segments.count('')
     if path_depth >= 4:
-        logger.info(f"   ✅ MATCH: Deep path indicates specific page")
-        return {'page_type': 'specific', 'confidence': 0.75, 'reason': f'Deep path ({path_depth} levels)'}
-    logger.info(f"   ❌ Shallow path ({path_depth} < 4)")
+        logger.debug("   ✅ MATCH: Deep path (%d levels) indicates specific page", path_depth)
+        return 'specific', 0.75, f'Deep path ({path_depth} levels)'
+    logger.debug("   ❌ Shallow path (%d < 4)", path_depth)
     
     # ========================================================================
     # GENERAL PAGE INDICATORS (High confidence)
     # ========================================================================
     
-    # Pattern 1: Ends in plural without ID
-    logger.info("\n🔎 Checking for GENERAL page indicators...")
-    
-    match = re.search(r'/(tours|properties|restaurants|activities)/?$', path)
-    if match:
-        logger.info(f"✅ MATCH: Ends in plural: {match.group()}")
-        return {'page_type': 'general', 'confidence': 0.90, 'reason': 'Ends in plural (listing page)'}
-    logger.info("   ❌ Doesn't end in plural")
-    
-    # Pattern 2: Category/destination pages
-    match = re.search(r'/(tours|properties|restaurants)/[^/]+/?$', path)
-    if match:
-        # Check if it's really a category (no ID-like pattern)
-        last_segment = path.rstrip('/').split('/')[-1]
-        logger.info(f"   📝 Category candidate: /{match.group(1)}/{last_segment}")
-        if not re.search(r'\d{4,}', last_segment):
-            logger.info(f"   ✅ MATCH: Category page (no ID in '{last_segment}')")
-            return {'page_type': 'general', 'confidence': 0.85, 'reason': 'Category/destination page'}
-        logger.info(f"   ❌ Has ID in last segment: {last_segment}")
-    logger.info("   ❌ Not a category page")
-    
-    # Pattern 3: Search/browse pages
-    match = re.search(r'/(search|browse|results|category)', path)
+    # Plural listing, category/destination and search/browse pages
+    match = _GENERAL_URL_RE.match(path)
     if match:
-        logger.info(f"✅ MATCH: Search/browse page: {match.group()}")
-        return {'page_type': 'general', 'confidence': 0.95, 'reason': 'Search/browse page'}
-    logger.info("   ❌ No search/browse pattern")
+        return _url_match_verdict(match)
+    logger.debug("   ❌ No plural, category or search/browse pattern")
     
     # Pattern 4: Homepage
-    if path in ['/', '', '/index', '/index.html']:
-        return {'page_type': 'general', 'confidence': 0.90, 'reason': 'Homepage'}
+    if path in _HOMEPAGE_PATHS:
+        return 'general', 0.90, 'Homepage'
     
     # ========================================================================
     # AMBIGUOUS - Return best guess with low confidence
     # ========================================================================
     
     # Check domain for hints
-    domain = parsed.netloc.lower()
-    if any(word in domain for word in ['coldwell', 'brevitas', 'encuentra24', 'remax']):
+    if any(word in domain for word in _REAL_ESTATE_DOMAIN_HINTS):
         # Real estate sites default to specific (usually property pages)
-        return {'page_type': 'specific', 'confidence': 0.60, 'reason': 'Real estate domain, likely property page'}
+        return 'specific', 0.60, 'Real estate domain, likely property page'
     
     # Default: assume specific (safer to try extracting 1 item than multiple)
-    return {'page_type': 'specific', 'confidence': 0.50, 'reason': 'URL pattern inconclusive, defaulting to specific'}
+    return 'specific', 0.50, 'URL pattern inconclusive, defaulting to specific'
 
 
 # ============================================================================
 # LEVEL 2: HTML STRUCTURE ANALYSIS (NO USADO)
 # ============================================================================
 
+# Keyword groups scored by _analyze_html_structure
+_HTML_KEYWORD_GROUPS = {
+    'booking': ('book now', 'reserve', 'check availability', 'add to cart', 'book this'),
+    'filter': ('filter', 'sort by', 'price range', 'showing', 'results'),
+    'pagination': ('next page', 'previous', 'page 1', 'page 2', 'of'),
+    # Specific tour keywords (transactional)
+    'tour_specific': ('what\'s included', 'tour details', 'meeting point', 'cancellation policy',
+                      'departure time', 'pick-up location', 'what to bring', 'tour itinerary'),
+    # General guide keywords (descriptive/informational)
+    'tour_guide': ('top tours', 'best tours', 'browse tours', 'all tours',
+                   'things to do', 'activities in', 'explore', 'discover',
+                   'guide to', 'visit', 'haven for', 'perfect for',
+                   'don\'t miss', 'must see', 'what to expect'),
+}
+# Leading text characters scanned for keyword groups (prices use the full text)
+_KEYWORD_SCAN_CHARS = 40000
+
+# Price mentions ($, USD, €, £ followed by digits)
+_PRICE_RE = re.compile(r'\$\d+|USD\s*\d+|€\d+|£\d+')
+
+_ALL_HTML_KEYWORDS = frozenset(kw for group in _HTML_KEYWORD_GROUPS.values() for kw in group)
+
+if AHOCORASICK_AVAILABLE:
+    _HTML_KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _ALL_HTML_KEYWORDS:
+        _HTML_KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _HTML_KEYWORD_AUTOMATON.make_automaton()
+
+
+def _count_keyword_groups(text: str) -> Dict[str, int]:
+    """
+    Count how many keywords of each group occur in the (lowercased) text.
+    
+    All groups are matched in one pass over the text when pyahocorasick is
+    installed, otherwise each distinct keyword is checked once.
+    """
+    if AHOCORASICK_AVAILABLE:
+        found = {keyword for _, keyword in _HTML_KEYWORD_AUTOMATON.iter(text)}
+    else:
+        found = {keyword for keyword in _ALL_HTML_KEYWORDS if keyword in text}
+    
+    return {
+        group: sum(1 for kw in keywords if kw in found)
+        for group, keywords in _HTML_KEYWORD_GROUPS.items()
+    }
+
+
 def _analyze_html_structure(html: str, content_type: str) -> Dict:
     """Analyze HTML structure for page type hints."""
     
-    logger.info("\\n" + "-" * 60)
-    logger.info("📊 HTML STRUCTURE ANALYSIS")
-    logger.info("-" * 60)
-    
-    soup = BeautifulSoup(html, 'html.parser')
-    text = soup.get_text().lower()
+    # None for an empty or unparseable document: no text, no cards
+    tree = parse_visible_tree(html) if html else None
     
-    logger.info(f"HTML size: {len(html):,} characters")
-    logger.info(f"Content type: {content_type}")
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("📊 HTML structure analysis - %d characters, content type: %s", len(html), content_type)
     
     indicators = []
     specific_score = 0
@@ -267,106 +437,93 @@ def _analyze_html_structure(html: str, content_type: str) -> Dict:
     # ========================================================================
     # Count potential item cards
     # ========================================================================
-    logger.info("\\n🔢 Counting item cards...")
-    card_count = _count_item_cards(soup, content_type)
-    logger.info(f"   Found: {card_count} cards")
+    card_count = _count_item_cards(tree, content_type) if tree is not None else 0
     
-    if card_count >= 5:
+    text = tree.text_content().lower() if tree is not None else ''
+    # Booking/filter/pagination cues sit in the header, nav and first screen
+    keyword_counts = _count_keyword_groups(text[:_KEYWORD_SCAN_CHARS])
+    
+    # Counting stops at _LISTING_CARD_COUNT, so a full count means "at least"
+    if card_count >= _LISTING_CARD_COUNT:
         general_score += 3
-        indicators.append(f'Found {card_count} item cards')
-        logger.info(f"   ✅ GENERAL indicator: {card_count} cards (score +3)")
+        indicators.append(f'Found {card_count}+ item cards')
+        if debug:
+            logger.debug("   ✅ GENERAL indicator: %d+ cards (score +3)", card_count)
     elif card_count >= 2:
         general_score += 1
         indicators.append(f'Found {card_count} possible items')
-        logger.info(f"   ⚠️ Possible GENERAL: {card_count} cards (score +1)")
+        if debug:
+            logger.debug("   ⚠️ Possible GENERAL: %d cards (score +1)", card_count)
     else:
-        logger.info(f"   ✅ SPECIFIC indicator: Few/no cards detected")
+        if debug:
+            logger.debug("   ✅ SPECIFIC indicator: %d cards", card_count)
         specific_score += 2
         indicators.append(f'Found {card_count} item (single page)')
     
     # ========================================================================
     # Check for booking elements (specific page indicator)
     # ========================================================================
-    logger.info("\n💳 Checking booking elements...")
-    booking_keywords = ['book now', 'reserve', 'check availability', 'add to cart', 'book this']
-    booking_found = sum(1 for kw in booking_keywords if kw in text)
-    logger.info(f"   Found: {booking_found} booking keywords")
+    booking_found = keyword_counts['booking']
     
     if booking_found >= 2:
         specific_score += 4  # Increased from 3 to 4 - booking is STRONG indicator
         indicators.append(f'Found {booking_found} booking elements')
-        logger.info(f"   ✅ SPECIFIC indicator: Multiple booking elements (score +4)")
-    else:
-        logger.info(f"   ❌ Not enough booking elements")
+        if debug:
+            logger.debug("   ✅ SPECIFIC indicator: %d booking elements (score +4)", booking_found)
     
     # ========================================================================
     # Check for filter/navigation elements (listing page indicator)
     # ========================================================================
-    logger.info("\n🔍 Checking filter/navigation elements...")
-    filter_keywords = ['filter', 'sort by', 'price range', 'showing', 'results']
-    filter_found = sum(1 for kw in filter_keywords if kw in text)
-    logger.info(f"   Found: {filter_found} filter keywords")
+    filter_found = keyword_counts['filter']
     
     if filter_found >= 2:
         general_score += 3
         indicators.append(f'Found {filter_found} filter elements')
-        logger.info(f"   ✅ GENERAL indicator: Filter/nav elements (score +3)")
-    else:
-        logger.info(f"   ❌ Not enough filter elements")
+        if debug:
+            logger.debug("   ✅ GENERAL indicator: %d filter/nav elements (score +3)", filter_found)
     
     # ========================================================================
     # Check for pagination (listing page indicator)
     # ========================================================================
-    logger.info("\n📊 Checking pagination...")
-    pagination_keywords = ['next page', 'previous', 'page 1', 'page 2', 'of']
-    pagination_found = sum(1 for kw in pagination_keywords if kw in text)
-    logger.info(f"   Found: {pagination_found} pagination keywords")
+    pagination_found = keyword_counts['pagination']
     
     if pagination_found >= 2:
         general_score += 2
         indicators.append('Found pagination')
-        logger.info(f"   ✅ GENERAL indicator: Pagination (score +2)")
-    else:
-        logger.info(f"   ❌ No pagination detected")
+        if debug:
+            logger.debug("   ✅ GENERAL indicator: Pagination (score +2)")
     
     # ========================================================================
     # Content-type specific keywords
     # ========================================================================
     if content_type == 'tour':
         # Specific tour keywords (transactional)
-        specific_tour_keywords = ['what\'s included', 'tour details', 'meeting point', 'cancellation policy', 
-                                 'departure time', 'pick-up location', 'what to bring', 'tour itinerary']
-        specific_tour_found = sum(1 for kw in specific_tour_keywords if kw in text)
+        specific_tour_found = keyword_counts['tour_specific']
         
         if specific_tour_found >= 2:
             specific_score += 2
             indicators.append(f'Found {specific_tour_found} specific tour details')
-            logger.info(f"   ✅ SPECIFIC indicator: Tour booking details (score +2)")
+            if debug:
+                logger.debug("   ✅ SPECIFIC indicator: Tour booking details (score +2)")
         
         # General guide keywords (descriptive/informational)
-        general_guide_keywords = ['top tours', 'best tours', 'browse tours', 'all tours',
-                                 'things to do', 'activities in', 'explore', 'discover',
-                                 'guide to', 'visit', 'haven for', 'perfect for', 
-                                 'don\'t miss', 'must see', 'what to expect']
-        general_guide_found = sum(1 for kw in general_guide_keywords if kw in text)
+        general_guide_found = keyword_counts['tour_guide']
         
         if general_guide_found >= 3:
             general_score += 3
             indicators.append(f'Found {general_guide_found} destination guide keywords')
-            logger.info(f"   ✅ GENERAL indicator: Destination guide language (score +3)")
+            if debug:
+                logger.debug("   ✅ GENERAL indicator: Destination guide language (score +3)")
         elif general_guide_found >= 1:
             general_score += 1
             indicators.append(f'Found {general_guide_found} guide keyword')
-            logger.info(f"   ⚠️ Possible GENERAL: Guide language (score +1)")
+            if debug:
+                logger.debug("   ⚠️ Possible GENERAL: Guide language (score +1)")
     
     # ========================================================================
     # Price counting (strong indicator)
     # ========================================================================
-    price_patterns = [r'\$\d+', r'USD\s*\d+', r'€\d+', r'£\d+']
-    total_prices = 0
-    for pattern in price_patterns:
-        matches = re.findall(pattern, text)
-        total_prices += len(matches)
+    total_prices = sum(1 for _ in _PRICE_RE.finditer(text))
     
     if total_prices >= 10:
         general_score += 3
@@ -378,16 +535,14 @@ def _analyze_html_structure(html: str, content_type: str) -> Dict:
     # ========================================================================
     # Calculate result
     # ========================================================================
-    logger.info("\\n🎯 FINAL SCORING:")
-    logger.info(f"   SPECIFIC score: {specific_score}")
-    logger.info(f"   GENERAL score: {general_score}")
-    logger.info(f"   Indicators: {indicators}")
+    logger.info("🎯 HTML scoring: specific %d, general %d", specific_score, general_score)
+    if debug:
+        logger.debug("   Indicators: %s", indicators)
     
     total_score = specific_score + general_score
     
     if total_score == 0:
         logger.info("   ⚠️ DECISION: No indicators - defaulting to SPECIFIC")
-        logger.info("-" * 60)
         return {
             'page_type': 'specific',
             'confidence': 0.40,
@@ -397,9 +552,7 @@ def _analyze_html_structure(html: str, content_type: str) -> Dict:
     # Determine page type based on scores
     if specific_score > general_score:
         confidence = specific_score / total_score
-        logger.info(f"   ✅ DECISION: SPECIFIC (score: {specific_score} > {general_score})")
-        logger.info(f"   Final confidence: {confidence:.0%}")
-        logger.info("-" * 60)
+        logger.info("   ✅ DECISION: SPECIFIC (confidence %.0f%%)", min(0.95, confidence) * 100)
         return {
             'page_type': 'specific',
             'confidence': min(0.95, confidence),
@@ -407,9 +560,7 @@ def _analyze_html_structure(html: str, content_type: str) -> Dict:
         }
     elif general_score > specific_score:
         confidence = general_score / total_score
-        logger.info(f"   ✅ DECISION: GENERAL (score: {general_score} > {specific_score})")
-        logger.info(f"   Final confidence: {confidence:.0%}")
-        logger.info("-" * 60)
+        logger.info("   ✅ DECISION: GENERAL (confidence %.0f%%)", min(0.95, confidence) * 100)
         return {
             'page_type': 'general',
             'confidence': min(0.95, confidence),
@@ -419,22 +570,17 @@ def _analyze_html_structure(html: str, content_type: str) -> Dict:
         # TIE BREAKER: Check which indicators are stronger
         # If we have cards (strong listing indicator), prefer general
         # If we have booking elements but few cards, prefer specific
-        logger.info(f"   ⚖️ TIE (score: {specific_score} == {general_score})")
         
         # Check for strong general indicators
-        if card_count >= 5:
-            logger.info(f"   ✅ TIEBREAKER: GENERAL ({card_count} cards is strong listing indicator)")
-            logger.info(f"   Final confidence: 60% (tie broken by card count)")
-            logger.info("-" * 60)
+        if card_count >= _LISTING_CARD_COUNT:
+            logger.info("   ✅ TIEBREAKER: GENERAL (%d+ cards is strong listing indicator)", card_count)
             return {
                 'page_type': 'general',
                 'confidence': 0.60,
-                'reason': f'Tie broken by {card_count} cards (listing indicator)'
+                'reason': f'Tie broken by {card_count}+ cards (listing indicator)'
             }
         else:
-            logger.info(f"   ✅ TIEBREAKER: SPECIFIC (few cards, booking elements suggest single item)")
-            logger.info(f"   Final confidence: 55% (tie broken by context)")
-            logger.info("-" * 60)
+            logger.info("   ✅ TIEBREAKER: SPECIFIC (few cards, booking elements suggest single item)")
             return {
                 'page_type': 'specific',
                 'confidence': 0.55,
@@ -442,25 +588,41 @@ def _analyze_html_structure(html: str, content_type: str) -> Dict:
             }
 
 
-def _count_item_cards(soup: BeautifulSoup, content_type: str) -> int:
-    """Count potential item cards in HTML."""
-    
-    card_patterns = [
-        {'class': lambda x: x and 'card' in str(x).lower()},
-        {'class': lambda x: x and 'item' in str(x).lower()},
-        {'class': lambda x: x and 'listing' in str(x).lower()},
-        {'class': lambda x: x and 'product' in str(x).lower()},
-        {'class': lambda x: x and 'result' in str(x).lower()},
-    ]
+# Class-name fragments that mark a div as a potential item card
+_CARD_CLASS_FRAGMENTS = ('card', 'item', 'listing', 'product', 'result')
+
+# Card count at which the page scores as a listing; counting stops there
+_LISTING_CARD_COUNT = 5
+
+
+def _count_item_cards(tree, content_type: str) -> int:
+    """
+    Count potential item cards in HTML.
     
-    max_count = 0
-    for pattern in card_patterns:
-        elements = soup.find_all('div', **pattern)
+    Walks the divs once: each div with a class is tested against every
+    fragment, and its text is only measured when some fragment matched.
+    Returns the largest count for any single fragment, stopping early at
+    _LISTING_CARD_COUNT since more cards don't change the scoring.
+    """
+    counts = [0] * len(_CARD_CLASS_FRAGMENTS)
+    
+    for div in tree.iter('div'):
+        css_class = div.get('class')
+        if not css_class:
+            continue
+        css_class = css_class.lower()
+        hits = [i for i, fragment in enumerate(_CARD_CLASS_FRAGMENTS) if fragment in css_class]
+        if not hits:
+            continue
+        
         # Filter meaningful elements (not tiny components)
-        meaningful = [el for el in elements if len(el.get_text(strip=True)) > 50]
-        max_count = max(max_count, len(meaningful))
+        if sum(len(t.strip()) for t in div.itertext()) > 50:
+            for i in hits:
+                counts[i] += 1
+                if counts[i] >= _LISTING_CARD_COUNT:
+                    return counts[i]
     
-    return max_count
+    return max(counts)
 
 
 # ============================================================================
@@ -478,35 +640,24 @@ def _analyze_with_openai(url: str, html: str, content_type: str) -> Dict:
     Time: 2-5s
     Accuracy: 95%+
     """
-    import openai
-    from django.conf import settings
-    import time
-    
     start_time = time.time()
     
-    logger.info("\n" + "=" * 60)
-    logger.info("🤖 LEVEL 3: OpenAI Analysis")
-    logger.info("=" * 60)
-    
     # Clean HTML - remove CSS, JS, and unnecessary tags
     html_cleaned = _clean_html_for_analysis(html)
     
     # Truncate cleaned HTML to fit within token limits
     # GPT-4o-mini has 128K context, but we limit to ~12K chars (~3K tokens) to reduce cost
     # 12K chars captures more content (pricing, features) while staying cost-effective
-    html_preview = html_cleaned[:12000] if len(html_cleaned) > 12000 else html_cleaned
+    html_preview = _html_preview(html)
     
-    logger.info(f"Original HTML: {len(html):,} chars → Cleaned: {len(html_cleaned):,} chars → Preview: {len(html_preview):,} chars")
-    logger.info(f"Content type: {content_type}")
+    logger.debug(
+        "🤖 OpenAI analysis - HTML: %d chars → cleaned: %d → preview: %d (content type: %s)",
+        len(html), len(html_cleaned), len(html_preview), content_type
+    )
     
     # DEBUG: Log preview to see what OpenAI is seeing
-    logger.info("=" * 60)
-    logger.info("🔍 HTML PREVIEW BEING SENT TO OPENAI:")
-    logger.info("=" * 60)
-    logger.info(html_preview[:1000])  # First 1000 chars
-    logger.info("...")
-    logger.info(html_preview[-500:])  # Last 500 chars
-    logger.info("=" * 60)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🔍 HTML preview being sent to OpenAI:\n%s\n...\n%s", html_preview[:1000], html_preview[-500:])
     
     prompt = f"""Classify this webpage as SPECIFIC or GENERAL for a data extraction system.
 
@@ -563,7 +714,7 @@ Respond ONLY with valid JSON:
 }}"""
 
     try:
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = get_openai_client()
         
         response = client.chat.completions.create(
             model="gpt-4o-mini",  # Fast and cheap
@@ -576,21 +727,18 @@ Respond ONLY with valid JSON:
             response_format={"type": "json_object"}
         )
         
-        import json
-        result = json.loads(response.choices[0].message.content)
+        result = json_utils.loads(response.choices[0].message.content)
         
         elapsed = time.time() - start_time
         cost = (response.usage.total_tokens / 1000) * 0.0015  # GPT-4o-mini pricing
         
-        logger.info(f"\n✅ OpenAI Analysis Complete:")
-        logger.info(f"   Page Type: {result['page_type']}")
-        logger.info(f"   Confidence: {result['confidence']:.0%}")
-        logger.info(f"   Reasoning: {result['reasoning']}")
-        logger.info(f"   Key Indicators: {', '.join(result['key_indicators'][:3])}")
-        logger.info(f"   Time: {elapsed:.2f}s")
-        logger.info(f"   Cost: ${cost:.4f}")
-        logger.info(f"   Tokens: {response.usage.total_tokens}")
-        logger.info("=" * 60)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "✅ OpenAI analysis complete: %s (confidence %s, %.2fs, $%.4f, %d tokens)",
+                result['page_type'], result['confidence'], elapsed, cost, response.usage.total_tokens
+            )
+            logger.debug("   Reasoning: %s", result['reasoning'])
+            logger.debug("   Key indicators: %s", ', '.join(map(str, result['key_indicators'][:3])))
         
         return {
             'page_type': result['page_type'],
@@ -660,6 +808,15 @@ def detect_content_type(url: str, html: Optional[str] = None) -> Dict:
             'time': 0.1
         }
     
+    # Same page, same prompt: reuse the earlier verdict (see detect_page_type)
+    cache = caches['extractions'] if settings.LLM_CACHE_ENABLED else None
+    cache_key = _content_type_cache_key(url, _html_preview(html))
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("♻️ Content type cache hit: %s", cached['content_type'])
+            return {**cached, 'cost': 0.0, 'time': 0.0}
+    
     logger.info("🤖 Calling OpenAI GPT-4o-mini for content type classification...")
     openai_result = _analyze_content_type_with_openai(url, html)
     
@@ -671,25 +828,33 @@ def detect_content_type(url: str, html: Optional[str] = None) -> Dict:
     logger.info(f"   Time: {openai_result['time']:.2f}s")
     logger.info("=" * 80)
     
+    # Failed analyses come back with cost 0 and are not worth keeping
+    if cache is not None and openai_result['cost']:
+        cache.set(cache_key, openai_result, timeout=settings.LLM_CACHE_TTL_HOURS * 3600)
+    
     return openai_result
 
 
+def _content_type_cache_key(url: str, html_preview: str) -> str:
+    """Cache key for a content type verdict, built from the prompt inputs."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (url or '', html_preview):
+        digest.update(part.encode())
+        digest.update(b'|')
+    return f"contenttype:{digest.hexdigest()}"
+
+
 def _analyze_content_type_with_openai(url: str, html: str) -> Dict:
     """
     Use OpenAI to classify content type.
     
     Similar to _analyze_with_openai but for content classification.
     """
-    import openai
-    from django.conf import settings
-    import time
-    import json
-    
     start_time = time.time()
     
     # Clean and truncate HTML
     html_cleaned = _clean_html_for_analysis(html)
-    html_preview = html_cleaned[:12000] if len(html_cleaned) > 12000 else html_cleaned
+    html_preview = _html_preview(html)
     
     logger.info(f"HTML: {len(html):,} → {len(html_cleaned):,} → {len(html_preview):,} chars")
     
@@ -743,7 +908,7 @@ Return your answer as JSON:
 }}"""
 
     try:
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = get_openai_client()
         
         response = client.chat.completions.create(
             model="gpt-4o-mini",
@@ -755,7 +920,7 @@ Return your answer as JSON:
             response_format={"type": "json_object"}
         )
         
-        result = json.loads(response.choices[0].message.content)
+        result = json_utils.loads(response.choices[0].message.content)
         
         elapsed = time.time() - start_time
         cost = (response.usage.total_tokens / 1000) * 0.0015  # GPT-4o-mini pricing
@@ -0,0 +1,140 @@
+"""
+Small nearest-neighbour cache for LLM classification results.
+
+Stores (embedding, result) pairs and answers lookups by cosine similarity,
+so near-duplicate pages reuse an earlier verdict instead of paying for
+another chat completion.
+
+Entries are shared through the default Django cache, one key per entry in
+a ring of max_entries slots, with an atomic counter handing out entry ids.
+Adding an entry writes only that entry, so concurrent workers don't
+overwrite each other; each process keeps a numpy copy of the index and
+pulls the entries added elsewhere when the counter moves.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Bounded cosine-similarity cache.
+
+    Args:
+        namespace: Cache key namespace (one per kind of result)
+        dimensions: Embedding size; vectors of any other size are rejected
+        threshold: Minimum cosine similarity for a hit
+        max_entries: Oldest entries are evicted beyond this size
+    """
+
+    def __init__(self, namespace: str, dimensions: int, threshold: float = 0.92, max_entries: int = 500):
+        self.namespace = namespace
+        self.dimensions = dimensions
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # Keyed by dimension too, so switching embedding models starts a new index
+        self._key_prefix = f"semcache:{namespace}:{dimensions}"
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Tuple[int, np.ndarray, Any]] = {}  # slot -> (id, vector, value)
+        self._matrix = None  # stacked vectors, rebuilt after changes
+        self._values = []
+        self._seen_id = 0  # highest shared entry id pulled into this process
+        self._local_id = 0  # id source when the cache backend can't count
+
+    def _entry_key(self, entry_id: int) -> str:
+        return f"{self._key_prefix}:{entry_id % self.max_entries}"
+
+    @property
+    def _counter_key(self) -> str:
+        return f"{self._key_prefix}:count"
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _accepts(self, vec: np.ndarray) -> bool:
+        if vec.shape[0] == self.dimensions:
+            return True
+        logger.warning(
+            f"⚠️ Semantic cache ({self.namespace}) ignoring {vec.shape[0]}-dim vector, expected {self.dimensions}"
+        )
+        return False
+
+    def _store_local(self, entry_id: int, vec: np.ndarray, value: Any):
+        slot = entry_id % self.max_entries
+        current = self._entries.get(slot)
+        if current is None or current[0] < entry_id:
+            self._entries[slot] = (entry_id, vec, value)
+            self._matrix = None
+
+    def _sync(self):
+        """Pull the entries other processes added since the last sync."""
+        cache = caches['default']
+        latest = cache.get(self._counter_key) or 0
+        if latest <= self._seen_id:
+            return
+
+        first = max(self._seen_id + 1, latest - self.max_entries + 1)
+        stored = cache.get_many([self._entry_key(entry_id) for entry_id in range(first, latest + 1)])
+        for entry in stored.values():
+            vec = np.frombuffer(entry['vector'], dtype=np.float32)
+            if entry['id'] >= first and self._accepts(vec):
+                self._store_local(entry['id'], vec, entry['value'])
+        self._seen_id = latest
+
+    def _next_id(self) -> int:
+        cache = caches['default']
+        cache.add(self._counter_key, 0, timeout=None)
+        try:
+            return cache.incr(self._counter_key)
+        except ValueError:
+            # Backend without shared state (DummyCache): this process only
+            self._local_id += 1
+            return self._local_id
+
+    def lookup(self, vector) -> Optional[Any]:
+        """Return the stored value most similar to vector, if above threshold."""
+        vec = self._normalize(vector)
+        if not self._accepts(vec):
+            return None
+
+        with self._lock:
+            self._sync()
+            if not self._entries:
+                return None
+
+            if self._matrix is None:
+                entries = list(self._entries.values())
+                self._matrix = np.stack([entry_vec for _, entry_vec, _ in entries])
+                self._values = [value for _, _, value in entries]
+
+            similarities = self._matrix @ vec
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                logger.info(f"🎯 Semantic cache hit ({self.namespace}, similarity {similarities[best]:.3f})")
+                return self._values[best]
+            return None
+
+    def add(self, vector, value: Any):
+        """Store a (vector, value) pair, locally and in the shared cache."""
+        vec = self._normalize(vector)
+        if not self._accepts(vec):
+            return
+
+        with self._lock:
+            self._sync()
+            entry_id = self._next_id()
+            self._store_local(entry_id, vec, value)
+            caches['default'].set(
+                self._entry_key(entry_id),
+                {'id': entry_id, 'vector': vec.tobytes(), 'value': value},
+                timeout=None
+            )
@@ -209,7 +209,8 @@ Responde ÚNICAMENTE con un objeto JSON válido (sin markdown, sin ```json):
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0,
-                max_tokens=1500
+                max_tokens=1500,
+                response_format={"type": "json_object"}
             )
             
             content = response.choices[0].message.content.strip()
@@ -186,7 +186,8 @@ CRITICAL:
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0,
-                max_tokens=1200
+                max_tokens=1200,
+                response_format={"type": "json_object"}
             )
             
             print(f"📊 Tokens usados: {response.usage.total_tokens} (prompt: {response.usage.prompt_tokens}, completion: {response.usage.completion_tokens})")
@@ -566,7 +567,8 @@ Return valid JSON only."""
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0,
-                max_tokens=1500
+                max_tokens=1500,
+                response_format={"type": "json_object"}
             )
             
             print(f"📊 Tokens usados: {response.usage.total_tokens} (prompt: {response.usage.prompt_tokens}, completion: {response.usage.completion_tokens})")
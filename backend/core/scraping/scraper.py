@@ -4,9 +4,10 @@ Falls back to requests for simple HTML pages.
 """
 
 import asyncio
+import contextlib
 import logging
 import random
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 import httpx
@@ -23,6 +24,12 @@ except ImportError:
     SCRAPFLY_AVAILABLE = False
     logger.warning("Scrapfly SDK not installed. Run: pip install scrapfly-sdk")
 
+try:
+    import h2  # noqa: F401 (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 async def reverse_geocode(lat: float, lng: float) -> Optional[str]:
     """
@@ -82,7 +89,13 @@ class WebScraper:
         'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
     ]
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            http_client: Optional shared httpx.AsyncClient. When given, httpx
+                scrapes reuse its connection pool instead of opening a new one.
+        """
+        self.http_client = http_client
         self.timeout = settings.SCRAPING_TIMEOUT_SECONDS
         self.user_agent = settings.SCRAPING_USER_AGENT
         self.rate_limit = settings.SCRAPING_RATE_LIMIT_PER_SECOND
@@ -469,9 +482,12 @@ class WebScraper:
             'Accept-Language': 'en-US,en;q=0.9,es;q=0.8',
         }
         
-        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
+        async with contextlib.AsyncExitStack() as stack:
+            client = self.http_client or await stack.enter_async_context(
+                httpx.AsyncClient(timeout=self.timeout, follow_redirects=True, http2=HTTP2_AVAILABLE)
+            )
             try:
-                response = await client.get(url, headers=headers)
+                response = await client.get(url, headers=headers, timeout=self.timeout)
                 response.raise_for_status()
                 
                 html_content = response.text
@@ -533,8 +549,8 @@ class WebScraper:
             )
             logger.info(f"🚀 [SCRAPFLY] Executing API call...")
             
-            # Execute scrape
-            api_response: ScrapeApiResponse = self.scrapfly_client.scrape(scrape_config)
+            # Execute scrape (blocking SDK call, kept off the event loop)
+            api_response: ScrapeApiResponse = await asyncio.to_thread(self.scrapfly_client.scrape, scrape_config)
             logger.info(f"✅ [SCRAPFLY] API call successful")
             logger.info(f"🔍 [SCRAPFLY] Response status: {api_response.scrape_result.get('status_code', 'N/A')}")
             
@@ -646,3 +662,31 @@ def scrape_url(url: str) -> Dict[str, any]:
     """
     scraper = WebScraper()
     return scraper.scrape_sync(url)
+
+
+async def scrape_urls_async(urls: List[str], concurrency: int = 16) -> List[Union[Dict[str, any], Exception]]:
+    """
+    Scrape several URLs concurrently over one shared httpx connection pool.
+    
+    With HTTP/2 available, concurrent requests to the same host are
+    multiplexed over a single connection instead of opening one each.
+    
+    Returns:
+        One entry per URL, in order: the scrape result dict, or the
+        exception raised for that URL.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async with httpx.AsyncClient(
+        timeout=settings.SCRAPING_TIMEOUT_SECONDS,
+        follow_redirects=True,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=20)
+    ) as client:
+        scraper = WebScraper(http_client=client)
+        
+        async def _scrape(url):
+            async with semaphore:
+                return await scraper.scrape(url)
+        
+        return await asyncio.gather(*(_scrape(url) for url in urls), return_exceptions=True)
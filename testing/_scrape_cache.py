@@ -0,0 +1,107 @@
+"""
+On-disk cache of scraped pages for the development scripts.
+
+Re-running a script while iterating on extraction logic re-scraped the
+same URL every time, which dominated the run. cached_scrape_url (and
+cached_scrape_urls_async for batches) store each successful scrape as
+gzipped JSON under testing/.cache/scrapes and serve it from disk until
+it is older than the TTL.
+
+Set SCRAPE_CACHE=0 to always scrape live.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent / '.cache' / 'scrapes'
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+
+def _cache_path(url: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json.gz"
+
+
+def _enabled() -> bool:
+    return os.environ.get('SCRAPE_CACHE', '1') != '0'
+
+
+def _load(url: str, ttl: int):
+    """Return the cached scrape of url if younger than ttl seconds, else None."""
+    path = _cache_path(url)
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _store(url: str, result) -> None:
+    """Cache a successful scrape; failed scrapes are retried next run."""
+    if isinstance(result, dict) and result.get('success'):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _cache_path(url)
+        tmp_path = path.with_suffix('.tmp')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(result, f, default=str)
+        tmp_path.replace(path)
+
+
+def cached_scrape_url(url: str, ttl: int = DEFAULT_TTL_SECONDS) -> dict:
+    """
+    scrape_url with a filesystem cache keyed on the URL.
+
+    Args:
+        url: Page URL
+        ttl: Maximum age of a cached scrape, in seconds
+
+    Returns:
+        The scrape result dict, as returned by scrape_url
+    """
+    from core.scraping.scraper import scrape_url
+
+    if not _enabled():
+        return scrape_url(url)
+
+    cached = _load(url, ttl)
+    if cached is not None:
+        print(f"♻️ Using cached scrape of {url}")
+        return cached
+
+    result = scrape_url(url)
+    _store(url, result)
+    return result
+
+
+async def cached_scrape_urls_async(urls, concurrency: int = 16, ttl: int = DEFAULT_TTL_SECONDS) -> list:
+    """
+    scrape_urls_async with the same filesystem cache.
+
+    Only the URLs without a fresh cached scrape are fetched (concurrently).
+
+    Returns:
+        One entry per URL, in order: the scrape result dict, or the
+        exception raised for that URL
+    """
+    from core.scraping.scraper import scrape_urls_async
+
+    if not _enabled():
+        return await scrape_urls_async(urls, concurrency=concurrency)
+
+    results = [_load(url, ttl) for url in urls]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if len(missing) < len(urls):
+        print(f"♻️ Using cached scrapes for {len(urls) - len(missing)}/{len(urls)} URLs")
+
+    if missing:
+        scraped = await scrape_urls_async([urls[i] for i in missing], concurrency=concurrency)
+        for i, result in zip(missing, scraped):
+            results[i] = result
+            _store(urls[i], result)
+
+    return results
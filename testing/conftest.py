@@ -0,0 +1,21 @@
+"""
+Shared pytest configuration for the testing/ suite.
+
+Django is set up once per session here, so test modules (and the
+standalone scripts when collected) don't each pay for app loading.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import django
+
+# Make the backend packages (config, core, apps) importable
+backend_root = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(backend_root))
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+
+django.setup()
+
@@ -6,6 +6,8 @@ Demonstrates detection and extraction for different content types.
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import django
 
 # Setup Django
@@ -169,11 +171,32 @@ def print_header(title):
     print()
 
 
-def demo_detection_and_extraction(content_type_key):
-    """Demo the full flow for a content type."""
+def run_detection_and_extraction(content_type_key):
+    """Detect and extract one sample (no output). Safe to run in a worker thread."""
+    sample = SAMPLE_CONTENTS[content_type_key]
+    
+    detection = detect_content_type(
+        url=sample['url'],
+        html=sample['html'],
+        use_llm_fallback=False
+    )
+    
+    try:
+        extracted_data = extract_content_data(
+            content=sample['html'],
+            content_type=detection['content_type'],
+            url=sample['url']
+        )
+    except Exception as e:
+        return detection, None, e
+    
+    return detection, extracted_data, None
+
+
+def demo_detection_and_extraction(content_type_key, detection, extracted_data, error):
+    """Demo the full flow for a content type, from precomputed results."""
     sample = SAMPLE_CONTENTS[content_type_key]
     url = sample['url']
-    html = sample['html']
     
     print_header(f"DEMO: {content_type_key.upper()}")
     
@@ -183,12 +206,6 @@ def demo_detection_and_extraction(content_type_key):
     print("🔍 STEP 1: DETECTING CONTENT TYPE")
     print_separator("-")
     
-    detection = detect_content_type(
-        url=url,
-        html=html,
-        use_llm_fallback=False
-    )
-    
     icon = get_content_type_icon(detection['content_type'])
     label = get_content_type_label(detection['content_type'])
     
@@ -200,14 +217,10 @@ def demo_detection_and_extraction(content_type_key):
     # Step 2: Extraction
     print("🤖 STEP 2: EXTRACTING DATA WITH LLM")
     print_separator("-")
-    print("⏳ Processing with OpenAI (this may take a few seconds)...\n")
     
     try:
-        extracted_data = extract_content_data(
-            content=html,
-            content_type=detection['content_type'],
-            url=url
-        )
+        if error is not None:
+            raise error
         
         # Step 3: Display results
         print("✅ EXTRACTION COMPLETE!")
@@ -269,13 +282,18 @@ def main():
     print()
     input("Press ENTER to start the demo...")
     
-    # Demo each content type
-    for content_type in ['real_estate', 'tour', 'restaurant']:
-        demo_detection_and_extraction(content_type)
-        
-        if content_type != 'restaurant':  # Not last item
-            print()
-            input("Press ENTER to continue to next demo...")
+    # Run the three demos concurrently (each blocks on an OpenAI call),
+    # then show them in order
+    content_types = ['real_estate', 'tour', 'restaurant']
+    print("⏳ Processing all demos with OpenAI (this may take a few seconds)...")
+    with ThreadPoolExecutor(max_workers=len(content_types)) as executor:
+        futures = {
+            content_type: executor.submit(run_detection_and_extraction, content_type)
+            for content_type in content_types
+        }
+    
+    for content_type, future in futures.items():
+        demo_detection_and_extraction(content_type, *future.result())
     
     print()
     print_separator("=")
@@ -3,6 +3,7 @@
 Test batch processing with automatic content type detection
 Simulates what happens when user uploads mixed URLs
 """
+import asyncio
 import sys
 import os
 sys.path.insert(0, '/Users/1di/kp-real-estate-llm-prototype/backend')
@@ -14,7 +15,7 @@ django.setup()
 
 from core.llm.content_detection import detect_content_type
 from core.llm.page_type_detection import detect_page_type
-from core.scraping.scraper import scrape_url
+from _scrape_cache import cached_scrape_urls_async
 
 # Simulate batch processing with mixed URLs
 batch_urls = [
@@ -31,16 +32,20 @@ print("System will auto-detect: content_type + page_type for each URL\n")
 total_cost = 0.0
 results = []
 
-for i, url in enumerate(batch_urls, 1):
+# Step 1: Scrape every URL concurrently over one connection pool
+print(f"📥 Scraping {len(batch_urls)} URLs concurrently...")
+scraped_pages = asyncio.run(cached_scrape_urls_async(batch_urls, concurrency=5))
+
+for i, (url, scraped) in enumerate(zip(batch_urls, scraped_pages), 1):
     print(f"\n{'=' * 100}")
     print(f"📄 URL {i}/{len(batch_urls)}")
     print(f"🔗 {url}")
     print("=" * 100)
     
     try:
-        # Step 1: Scrape
-        print("📥 Scraping...")
-        scraped = scrape_url(url)
+        if isinstance(scraped, Exception):
+            print(f"❌ Failed to scrape: {scraped}")
+            continue
         if not scraped.get('success'):
             print(f"❌ Failed to scrape")
             continue
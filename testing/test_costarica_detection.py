@@ -6,7 +6,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
 django.setup()
 
-from core.scraping.scraper import scrape_url
+from _scrape_cache import cached_scrape_url as scrape_url
 from core.llm.content_detection import detect_content_type
 from core.llm.page_type_detection import detect_page_type
 
@@ -11,7 +11,7 @@ import django
 django.setup()
 
 from core.llm.extraction import extract_content_data, PropertyExtractor
-from core.scraping.scraper import scrape_url
+from _scrape_cache import cached_scrape_url as scrape_url
 import json
 
 # Test URL
@@ -10,9 +10,9 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
 import django
 django.setup()
 
+from core.llm import json_utils
 from core.llm.extraction import extract_content_data, PropertyExtractor
-from core.scraping.scraper import scrape_url
-import json
+from _scrape_cache import cached_scrape_url as scrape_url
 
 # Test URL
 test_url = 'https://skyadventures.travel/hanging-bridges/'
@@ -100,14 +100,15 @@ print(f"   Content Type: {extracted.get('content_type', 'N/A')}")
 print(f"   Page Type: {extracted.get('page_type', 'N/A')}")
 print(f"   Tokens Used: {extracted.get('tokens_used', 'N/A')}")
 
-# Count filled fields
-filled_fields = sum(1 for k, v in extracted.items() 
-                   if v not in [None, '', [], {}, 'N/A'] 
-                   and not k.endswith('_evidence')
-                   and k not in ['raw_html', 'field_confidence', 'extracted_at', 'tokens_used'])
-total_fields = len([k for k in extracted.keys() 
-                   if not k.endswith('_evidence') 
-                   and k not in ['raw_html', 'field_confidence', 'extracted_at', 'tokens_used']])
+# Count filled fields (one pass over the result)
+excluded_fields = {'raw_html', 'field_confidence', 'extracted_at', 'tokens_used'}
+filled_fields = total_fields = 0
+for k, v in extracted.items():
+    if k in excluded_fields or k.endswith('_evidence'):
+        continue
+    total_fields += 1
+    if v not in (None, '', [], {}, 'N/A'):
+        filled_fields += 1
 
 print(f"\n📊 COVERAGE:")
 print(f"   Filled fields: {filled_fields}/{total_fields} ({filled_fields/total_fields*100:.0f}%)")
@@ -127,8 +128,8 @@ print("=" * 80)
 
 # Export full result to JSON for inspection
 output_file = '/Users/1di/kp-real-estate-llm-prototype/test_extraction_output.json'
-with open(output_file, 'w') as f:
+with open(output_file, 'wb') as f:
     # Remove raw_html to make it readable
     export_data = {k: v for k, v in extracted.items() if k != 'raw_html'}
-    json.dump(export_data, f, indent=2, default=str)
+    f.write(json_utils.dumps(export_data, indent=True, default=str))
 print(f"\n💾 Full results saved to: {output_file}")
@@ -11,8 +11,27 @@ import django
 django.setup()
 
 from core.llm.page_type_detection import detect_page_type
+import asyncio
 import httpx
 
+
+async def fetch_all(urls, concurrency=8):
+    """Fetch every URL concurrently over one client; exceptions are returned per URL."""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    # One client for every test URL: keep-alive (and HTTP/2) reuse connections
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        http2=True
+    ) as client:
+        async def _fetch(url):
+            async with semaphore:
+                return await client.get(url)
+        
+        return await asyncio.gather(*(_fetch(url) for url in urls), return_exceptions=True)
+
 # Test cases
 test_urls = [
     {
@@ -38,16 +57,19 @@ print("=" * 80)
 
 results = {'pass': 0, 'fail': 0, 'error': 0}
 
-for i, test in enumerate(test_urls, 1):
+# Scrape with httpx directly, all URLs at once
+print("📥 Scraping...")
+responses = asyncio.run(fetch_all([test['url'] for test in test_urls]))
+
+for i, (test, response) in enumerate(zip(test_urls, responses), 1):
     print(f"\n{'='*80}")
     print(f"TEST {i}/3: {test['url']}")
     print(f"Expected: {test['expected']} ({test['reason']})")
     print(f"{'='*80}")
     
     try:
-        # Scrape with httpx directly
-        print("�� Scraping...")
-        response = httpx.get(test['url'], follow_redirects=True, timeout=10)
+        if isinstance(response, Exception):
+            raise response
         html = response.text
         print(f"✅ Got {len(html):,} characters")
         
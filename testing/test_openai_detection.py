@@ -2,6 +2,7 @@
 Test Level 3 OpenAI detection for edge cases.
 """
 
+import asyncio
 import sys
 import os
 
@@ -14,7 +15,7 @@ import django
 django.setup()
 
 from core.llm.page_type_detection import detect_page_type
-from core.scraping.scraper import scrape_url
+from _scrape_cache import cached_scrape_urls_async
 from core.llm.content_detection import detect_content_type
 import logging
 
@@ -22,8 +23,12 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Stop at the first failing case (CI, or run with -x) instead of spending
+# more OpenAI calls on a run that has already failed
+FAIL_FAST = os.environ.get('CI') == 'true' or '-x' in sys.argv
 
-def test_with_openai(url, expected_type, description):
+
+def test_with_openai(url, expected_type, description, scrape_result):
     """Test a single URL with OpenAI Level 3."""
     
     print(f"\n{'='*80}")
@@ -33,9 +38,10 @@ def test_with_openai(url, expected_type, description):
     print(f"{'='*80}\n")
     
     try:
-        # Scrape
-        print("📥 Scraping URL...")
-        scrape_result = scrape_url(url)
+        # Scraped up front by main()
+        if isinstance(scrape_result, Exception):
+            print(f"❌ Scraping failed: {scrape_result}")
+            return False
         
         if not scrape_result['success']:
             print(f"❌ Scraping failed: {scrape_result.get('error', 'Unknown error')}")
@@ -121,7 +127,11 @@ def main():
     total_cost = 0.0
     total_time = 0.0
     
-    for i, test in enumerate(tests, 1):
+    # Scrape every URL concurrently before running the detections
+    print(f"\n📥 Scraping {len(tests)} URLs concurrently...")
+    scrape_results = asyncio.run(cached_scrape_urls_async([test['url'] for test in tests], concurrency=8))
+    
+    for i, (test, scrape_result) in enumerate(zip(tests, scrape_results), 1):
         print(f"\n\n{'#'*80}")
         print(f"TEST {i}/{len(tests)}")
         print(f"{'#'*80}")
@@ -129,13 +139,18 @@ def main():
         success = test_with_openai(
             url=test['url'],
             expected_type=test['expected'],
-            description=test['description']
+            description=test['description'],
+            scrape_result=scrape_result
         )
         
         results.append({
             'test': test['description'],
             'success': success
         })
+        
+        if not success and FAIL_FAST:
+            print(f"\n⛔ Stopping after first failure ({i}/{len(tests)} run)")
+            break
     
     # Summary
     print(f"\n\n{'='*80}")
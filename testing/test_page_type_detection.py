@@ -3,8 +3,11 @@ Test page type detection (specific vs general) for different URLs.
 Tests the cascading detection system: URL patterns → HTML structure analysis.
 """
 
+import asyncio
+import io
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
@@ -15,76 +18,103 @@ import django
 django.setup()
 
 from core.llm.page_type_detection import detect_page_type
-from core.scraping.scraper import scrape_url
+from _scrape_cache import cached_scrape_urls_async
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# URL pattern verdicts this confident (ID and detail-page paths) are
+# returned without calling OpenAI
+URL_SHORT_CIRCUIT_THRESHOLD = 0.95
 
-def test_url(url, expected_page_type, description):
-    """Test page type detection for a URL."""
-    print(f"\n{'='*80}")
-    print(f"🧪 TEST: {description}")
-    print(f"URL: {url}")
-    print(f"Expected: {expected_page_type}")
-    print(f"{'='*80}")
+# Stop at the first failing case (CI, or run with -x) instead of spending
+# more OpenAI calls on a run that has already failed
+FAIL_FAST = os.environ.get('CI') == 'true' or '-x' in sys.argv
+
+
+def test_url(url, expected_page_type, description, scrape_result, out=sys.stdout):
+    """Test page type detection for a URL, writing its report to out."""
+    print(f"\n{'='*80}", file=out)
+    print(f"🧪 TEST: {description}", file=out)
+    print(f"URL: {url}", file=out)
+    print(f"Expected: {expected_page_type}", file=out)
+    print(f"{'='*80}", file=out)
     
     try:
-        # Scrape the URL
-        print("\n📥 Scraping URL...")
-        scrape_result = scrape_url(url)
+        # Scraped up front by main()
+        if isinstance(scrape_result, Exception):
+            print(f"❌ Scraping failed: {scrape_result}", file=out)
+            return False
         
         if not scrape_result['success']:
-            print(f"❌ Scraping failed: {scrape_result.get('error', 'Unknown error')}")
+            print(f"❌ Scraping failed: {scrape_result.get('error', 'Unknown error')}", file=out)
             return False
         
         html = scrape_result['html']
-        print(f"✅ Scraped {len(html)} characters")
+        print(f"✅ Scraped {len(html)} characters", file=out)
         
         # Detect content type first (tours, real_estate, etc.)
         from core.llm.content_detection import detect_content_type
         content_detection = detect_content_type(url=url, html=html, user_override=None, use_llm_fallback=False)
         detected_content_type = content_detection['content_type']
         
-        print(f"\n📋 Content Type: {detected_content_type}")
+        print(f"\n📋 Content Type: {detected_content_type}", file=out)
         
         # Detect page type
-        print(f"\n🔍 Detecting page type...")
-        result = detect_page_type(url=url, html=html, content_type=detected_content_type)
+        print(f"\n🔍 Detecting page type...", file=out)
+        result = detect_page_type(
+            url=url,
+            html=html,
+            content_type=detected_content_type,
+            l1_short_circuit_threshold=URL_SHORT_CIRCUIT_THRESHOLD
+        )
         
         # Display results
-        print(f"\n📊 DETECTION RESULTS:")
-        print(f"   Page Type: {result['page_type']}")
-        print(f"   Confidence: {result['confidence']:.1%}")
-        print(f"   Method: {result['method']}")
-        print(f"   Detection Time: {result.get('time_seconds', result.get('detection_time_seconds', 0)):.2f}s")
-        print(f"   Cost: ${result.get('cost', result.get('detection_cost', 0)):.4f}")
+        print(f"\n📊 DETECTION RESULTS:", file=out)
+        print(f"   Page Type: {result['page_type']}", file=out)
+        print(f"   Confidence: {result['confidence']:.1%}", file=out)
+        print(f"   Method: {result['method']}", file=out)
+        print(f"   Detection Time: {result.get('time_seconds', result.get('detection_time_seconds', 0)):.2f}s", file=out)
+        print(f"   Cost: ${result.get('cost', result.get('detection_cost', 0)):.4f}", file=out)
         
         if result.get('indicators') and isinstance(result['indicators'], dict):
-            print(f"\n   Indicators:")
+            print(f"\n   Indicators:", file=out)
             for key, value in result['indicators'].items():
                 if value is not None:
-                    print(f"      {key}: {value}")
+                    print(f"      {key}: {value}", file=out)
         
         # Check if matches expected
         success = result['page_type'] == expected_page_type
         
         if success:
-            print(f"\n✅ TEST PASSED: Detected '{result['page_type']}' as expected")
+            print(f"\n✅ TEST PASSED: Detected '{result['page_type']}' as expected", file=out)
         else:
-            print(f"\n❌ TEST FAILED: Expected '{expected_page_type}' but got '{result['page_type']}'")
+            print(f"\n❌ TEST FAILED: Expected '{expected_page_type}' but got '{result['page_type']}'", file=out)
         
         return success
         
     except Exception as e:
-        print(f"\n❌ ERROR: {e}")
+        print(f"\n❌ ERROR: {e}", file=out)
         import traceback
-        traceback.print_exc()
+        traceback.print_exc(file=out)
         return False
 
 
+def run_one(test, scrape_result):
+    """Run one test case, returning (success, buffered report)."""
+    out = io.StringIO()
+    success = test_url(
+        url=test['url'],
+        expected_page_type=test['expected'],
+        description=test['description'],
+        scrape_result=scrape_result,
+        out=out
+    )
+    return success, out.getvalue()
+
+
 def main():
     """Run all page type detection tests."""
     
@@ -135,23 +165,37 @@ def main():
     
     results = []
     
-    for i, test in enumerate(tests, 1):
-        print(f"\n\n{'#'*80}")
-        print(f"TEST {i}/{len(tests)}")
-        print(f"{'#'*80}")
-        
-        success = test_url(
-            url=test['url'],
-            expected_page_type=test['expected'],
-            description=test['description']
-        )
+    # Scrape every URL concurrently before running the detections
+    print(f"\n📥 Scraping {len(tests)} URLs concurrently...")
+    scrape_results = asyncio.run(cached_scrape_urls_async([test['url'] for test in tests], concurrency=8))
+    
+    # Detections (mostly OpenAI round trips) run concurrently; each test
+    # reports into its own buffer, printed in order as results come in
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(run_one, test, scrape_result)
+            for test, scrape_result in zip(tests, scrape_results)
+        ]
         
-        results.append({
-            'test': test['description'],
-            'url': test['url'],
-            'expected': test['expected'],
-            'success': success
-        })
+        for i, (test, future) in enumerate(zip(tests, futures), 1):
+            success, report = future.result()
+            
+            print(f"\n\n{'#'*80}")
+            print(f"TEST {i}/{len(tests)}")
+            print(f"{'#'*80}")
+            sys.stdout.write(report)
+            
+            results.append({
+                'test': test['description'],
+                'url': test['url'],
+                'expected': test['expected'],
+                'success': success
+            })
+            
+            if not success and FAIL_FAST:
+                print(f"\n⛔ Stopping after first failure ({i}/{len(tests)} run)")
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
     
     # Print summary
     print(f"\n\n{'='*80}")
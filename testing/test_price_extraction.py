@@ -5,7 +5,6 @@ Test price extraction with multiple price categories
 import os
 import sys
 import django
-import json
 
 # Configure Django
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
@@ -13,6 +12,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
 from core.scraping.scraper import scrape_url
+from core.llm import json_utils
 from core.llm.extraction import PropertyExtractor
 
 def test_price_extraction():
@@ -53,7 +53,7 @@ def test_price_extraction():
     if result.get('price_details'):
         print(f"\n💳 Price Details (JSON):")
         price_details = result['price_details']
-        print(json.dumps(price_details, indent=2))
+        print(json_utils.dumps(price_details, indent=True).decode())
         
         # Analyze coverage
         categories = ['adults', 'children', 'students', 'nationals', 'seniors', 'groups']
@@ -15,7 +15,7 @@ import django
 django.setup()
 
 from core.llm.page_type_detection import detect_page_type
-from core.scraping.scraper import scrape_url
+from _scrape_cache import cached_scrape_url as scrape_url
 from core.llm.content_detection import detect_content_type
 
 # Configure detailed logging
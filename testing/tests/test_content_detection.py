@@ -0,0 +1,127 @@
+"""
+Tests for hybrid content type detection.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from core.llm.content_types import CONTENT_TYPES
+from core.llm.content_detection import (
+    classify_with_llm,
+    detect_by_domain,
+    detect_by_keywords,
+    detect_content_type,
+)
+
+
+def _reference_keyword_scores(text):
+    """Straightforward per-type scan the optimized matcher must agree with."""
+    return {
+        content_type: sum(1 for kw in config['keywords'] if kw.lower() in text) / len(config['keywords'])
+        for content_type, config in CONTENT_TYPES.items()
+    }
+
+
+class TestDetectByDomain:
+
+    def test_known_domain(self):
+        assert detect_by_domain('https://www.encuentra24.com/costa-rica-en/listing/1') == 'real_estate'
+
+    def test_first_content_type_wins_on_shared_pattern(self):
+        # 'tripadvisor' is listed under both tour and restaurant
+        assert detect_by_domain('https://www.tripadvisor.com/Restaurant_Review-g1-d2') == 'tour'
+
+    def test_unknown_domain(self):
+        assert detect_by_domain('https://example.org/page') is None
+
+    def test_empty_url(self):
+        assert detect_by_domain('') is None
+
+
+class TestDetectByKeywords:
+
+    @pytest.mark.parametrize('text', [
+        'beautiful 3 bedroom house for sale with pool',
+        'guided tour with excursion and adventure activities',
+        'restaurant menu with local cuisine and dishes, reservation required',
+        '',
+    ])
+    def test_matches_reference_scores(self, text):
+        scores = _reference_keyword_scores(text)
+        best_type = max(scores, key=scores.get)
+
+        content_type, confidence = detect_by_keywords('', min_confidence=0.0, text=text)
+
+        assert confidence == pytest.approx(scores[best_type])
+        assert content_type == best_type
+
+    def test_below_threshold_returns_none(self):
+        content_type, confidence = detect_by_keywords('', min_confidence=0.99, text='tour')
+
+        assert content_type is None
+        assert confidence < 0.99
+
+    def test_parses_html_when_no_text_given(self):
+        html = '<html><body><script>var tour = 1;</script><p>Restaurant menu cuisine</p></body></html>'
+
+        content_type, _ = detect_by_keywords(html, min_confidence=0.0)
+
+        assert content_type == 'restaurant'
+
+
+class TestDetectContentType:
+
+    def test_user_override(self):
+        result = detect_content_type('https://example.org', user_override='tour')
+
+        assert result['content_type'] == 'tour'
+        assert result['method'] == 'user_override'
+
+    def test_domain_match_without_html(self):
+        result = detect_content_type('https://www.viator.com/tours/x/d1-2')
+
+        assert result['content_type'] == 'tour'
+        assert result['method'] == 'domain'
+
+    def test_default_fallback_without_html(self):
+        result = detect_content_type('https://example.org/page')
+
+        assert result['content_type'] == 'real_estate'
+        assert result['method'] == 'default_fallback'
+
+    def test_llm_fallback_skipped_without_html(self):
+        with patch('core.llm.content_detection.classify_with_llm') as classify:
+            result = detect_content_type('https://example.org/page', use_llm_fallback=True)
+
+        classify.assert_not_called()
+        assert result['method'] == 'default_fallback'
+
+
+class TestClassifyWithLlm:
+
+    HTML = '<html><body><p>Guided canopy tour with zipline</p></body></html>'
+
+    def _classify(self, openai_result):
+        cache = MagicMock()
+        cache.lookup.return_value = None
+        with patch('core.llm.content_detection._get_preview_embedding', return_value=[1.0, 0.0]), \
+                patch('core.llm.content_detection._get_classification_cache', return_value=cache), \
+                patch('core.llm.page_type_detection.detect_content_type', return_value=openai_result):
+            verdict = classify_with_llm(self.HTML, url='https://example.org/canopy')
+        return verdict, cache
+
+    def test_successful_call_is_cached(self):
+        verdict, cache = self._classify({
+            'content_type': 'tour', 'confidence': 0.9, 'reasoning': 'Zipline tour', 'cost': 0.002,
+        })
+
+        assert verdict == ('tour', 0.9)
+        cache.add.assert_called_once_with([1.0, 0.0], {'content_type': 'tour', 'confidence': 0.9})
+
+    def test_failed_call_is_not_cached(self):
+        verdict, cache = self._classify({
+            'content_type': 'tour', 'confidence': 0.40, 'reasoning': 'Detection failed: timeout', 'cost': 0.0,
+        })
+
+        assert verdict == ('tour', 0.40)
+        cache.add.assert_not_called()
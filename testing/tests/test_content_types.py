@@ -0,0 +1,21 @@
+"""
+Tests for the extraction prompt table.
+"""
+
+import pytest
+from core.llm.content_types import _PROMPT_TABLE
+
+LEAN_PROMPTS = {key: prompt for key, prompt in _PROMPT_TABLE.items() if not key[2]}
+
+
+@pytest.mark.parametrize('key', sorted(LEAN_PROMPTS), ids=lambda key: f'{key[0]}-{key[1]}')
+def test_lean_prompt_asks_for_no_evidence(key):
+    prompt = LEAN_PROMPTS[key]
+
+    assert 'evidence"' not in prompt
+    assert '"confidence_reasoning"' not in prompt
+    assert 'derived_from' not in prompt
+
+
+def test_full_prompt_keeps_evidence_instructions():
+    assert '"confidence_reasoning"' in _PROMPT_TABLE[('tour', 'general', True)]
@@ -4,7 +4,10 @@ Tests for PropertyExtractor.
 
 import pytest
 from unittest.mock import patch, MagicMock
+from datetime import datetime, timezone as dt_timezone
 from decimal import Decimal
+from django.core.cache import caches
+from django.test import override_settings
 from core.llm.extraction import PropertyExtractor, ExtractionError
 
 
@@ -133,3 +136,59 @@ class TestPropertyExtractor:
         assert isinstance(validated['bathrooms'], Decimal)
         assert isinstance(validated['square_meters'], Decimal)
         assert validated['price_usd'] == Decimal('450000')
+
+
+@pytest.fixture
+def extraction_cache():
+    with override_settings(
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'extractions': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'extraction-cache-tests',
+            },
+        },
+        LLM_CACHE_ENABLED=True,
+        OPENAI_API_KEY='test-key',
+    ):
+        caches['extractions'].clear()
+        yield caches['extractions']
+
+
+class TestExtractionCache:
+    
+    def test_cache_hit_skips_llm_and_restamps_extracted_at(self, extraction_cache, sample_html):
+        extractor = PropertyExtractor()
+        extractor.client = MagicMock()
+        response = extractor.client.chat.completions.create.return_value
+        response.choices = [MagicMock(message=MagicMock(content='{"property_name": "Villa"}'))]
+        response.usage.total_tokens = 1200
+        
+        first_run = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+        second_run = datetime(2026, 6, 1, tzinfo=dt_timezone.utc)
+        with patch.object(extractor, '_fill_missing_fields_with_inference', side_effect=lambda data, *args: data):
+            with patch('core.llm.extraction.timezone.now', return_value=first_run):
+                first = extractor.extract_from_html(sample_html, url='https://example.com/a')
+            with patch('core.llm.extraction.timezone.now', return_value=second_run):
+                second = extractor.extract_from_html(sample_html, url='https://example.com/b')
+        
+        assert extractor.client.chat.completions.create.call_count == 1
+        assert first['tokens_used'] == 1200
+        assert second['tokens_used'] == 0
+        assert second['property_name'] == 'Villa'
+        assert second['source_url'] == 'https://example.com/b'
+        assert first['extracted_at'] == first_run
+        assert second['extracted_at'] == second_run
+    
+    def test_failed_extraction_is_not_cached(self, extraction_cache, sample_html):
+        extractor = PropertyExtractor()
+        extractor.client = MagicMock()
+        response = extractor.client.chat.completions.create.return_value
+        response.choices = [MagicMock(message=MagicMock(content='not json'))]
+        response.usage.total_tokens = 1200
+        
+        for _ in range(2):
+            with pytest.raises(ExtractionError):
+                extractor.extract_from_html(sample_html)
+        
+        assert extractor.client.chat.completions.create.call_count == 2
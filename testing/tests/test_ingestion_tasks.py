@@ -0,0 +1,78 @@
+"""
+Tests for the batch ingestion Celery task.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from django.conf import settings
+from apps.ingestion.tasks import generate_embedding_async, ingest_urls_batch_task
+from core.scraping.scraper import ScraperError
+
+
+@pytest.fixture
+def models():
+    with patch('apps.tenants.models.Tenant') as tenant, patch('apps.properties.models.Property') as prop:
+        yield tenant, prop
+
+
+def _run(outcomes, urls):
+    with patch('apps.ingestion.tasks._ingest_many', AsyncMock(return_value=outcomes)):
+        return ingest_urls_batch_task(urls, 'tenant-id', 'user-id')
+
+
+class TestIngestUrlsBatchTask:
+
+    def test_existing_and_duplicate_urls_are_not_counted_as_created(self, models):
+        _, prop = models
+        prop.objects.filter.return_value.values_list.return_value = ['https://a.com/1']
+        outcomes = [
+            ('https://a.com/1', {'source_url': 'https://a.com/1'}, None),
+            ('https://a.com/2', {'source_url': 'https://a.com/2'}, None),
+            ('https://a.com/2', {'source_url': 'https://a.com/2'}, None),
+        ]
+
+        result = _run(outcomes, [url for url, _, _ in outcomes])
+
+        assert result['created'] == 1
+        assert result['skipped'] == 2
+        assert len(prop.objects.bulk_create.call_args.args[0]) == 1
+
+    def test_retries_only_urls_with_scraper_errors(self, models):
+        _, prop = models
+        prop.objects.filter.return_value.values_list.return_value = []
+        error = ScraperError('timeout')
+        outcomes = [
+            ('https://a.com/1', {'source_url': 'https://a.com/1'}, None),
+            ('https://a.com/2', None, error),
+            ('https://a.com/3', None, Exception('Failed to scrape URL')),
+        ]
+
+        with patch.object(ingest_urls_batch_task, 'retry', return_value=RuntimeError('retry')) as retry:
+            with pytest.raises(RuntimeError):
+                _run(outcomes, [url for url, _, _ in outcomes])
+
+        assert retry.call_args.kwargs['args'] == (['https://a.com/2'], 'tenant-id', 'user-id')
+        assert retry.call_args.kwargs['exc'] is error
+        # The successful URL was saved before retrying
+        assert len(prop.objects.bulk_create.call_args.args[0]) == 1
+
+
+@pytest.mark.django_db
+class TestGenerateEmbeddingAsync:
+
+    def test_embedding_written_without_loading_search_content(self, django_assert_num_queries):
+        from apps.properties.models import Property
+        from apps.tenants.models import Tenant
+
+        tenant = Tenant.objects.create(name='Test', slug='test')
+        property_obj = Property.objects.create(tenant=tenant, property_name='Villa')
+        Property.objects.filter(id=property_obj.id).update(content_for_search='')
+
+        with patch('core.llm.embeddings.generate_property_embedding', return_value=[0.1] * settings.EMBEDDING_DIMENSIONS):
+            # One SELECT of the embedding fields, one UPDATE of the vector
+            with django_assert_num_queries(2):
+                result = generate_embedding_async(str(property_obj.id))
+
+        assert result['success'] is True
+        assert Property.objects.get(id=property_obj.id).content_for_search == ''
@@ -0,0 +1,114 @@
+"""
+Tests for page type detection.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+
+from core.llm.html_utils import parse_visible_tree
+from core.llm.page_type_detection import (
+    _analyze_html_structure,
+    _count_item_cards,
+    _page_type_cache_key,
+    detect_page_type,
+)
+
+
+def _page(body):
+    return f'<html><body>{body}</body></html>'
+
+
+def _cards(count, css_class='card'):
+    return ''.join(
+        f'<div class="{css_class}">Rainforest canopy adventure number {i} with a local naturalist guide</div>'
+        for i in range(count)
+    )
+
+
+class TestAnalyzeHtmlStructure:
+
+    def test_card_wall_is_scored_like_any_listing(self):
+        result = _analyze_html_structure(_page(_cards(30)), 'tour')
+
+        assert result['page_type'] == 'general'
+        assert result['confidence'] == pytest.approx(0.75)
+
+    def test_capped_card_count_is_reported_as_a_minimum(self):
+        result = _analyze_html_structure(_page(_cards(30)), 'tour')
+
+        assert 'Found 5+ item cards' in result['reason']
+
+    def test_booking_page_is_scored_like_any_single_item(self):
+        html = _page('<h1>Canopy Tour</h1><p>Book now, reserve or check availability; add to cart.</p>')
+
+        result = _analyze_html_structure(html, 'tour')
+
+        assert result['page_type'] == 'specific'
+        assert result['confidence'] == pytest.approx(0.95)
+
+
+class TestCountItemCards:
+
+    def test_counting_stops_at_listing_threshold(self):
+        tree = parse_visible_tree(_page(_cards(30)))
+
+        assert _count_item_cards(tree, 'tour') == 5
+
+    def test_counts_below_threshold(self):
+        tree = parse_visible_tree(_page(_cards(3)))
+
+        assert _count_item_cards(tree, 'tour') == 3
+
+
+@pytest.fixture
+def verdict_cache():
+    with override_settings(
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'extractions': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'page-type-cache-tests',
+            },
+        },
+        LLM_CACHE_ENABLED=True,
+    ):
+        caches['extractions'].clear()
+        yield caches['extractions']
+
+
+def _openai_result(cost):
+    return {'page_type': 'general', 'confidence': 0.9, 'reason': 'Lists several tours', 'cost': cost, 'time': 1.5}
+
+
+class TestPageTypeCache:
+
+    URL = 'https://example.com/tours'
+
+    def test_cache_hit_skips_openai(self, verdict_cache):
+        html = _page(_cards(3))
+        with patch('core.llm.page_type_detection._analyze_with_openai', return_value=_openai_result(0.001)) as analyze:
+            first = detect_page_type(self.URL, html, 'tour')
+            second = detect_page_type(self.URL, html, 'tour')
+
+        assert analyze.call_count == 1
+        assert second['page_type'] == first['page_type'] == 'general'
+        assert second['cost'] == 0.0
+
+    def test_failed_analysis_is_not_cached(self, verdict_cache):
+        html = _page(_cards(3))
+        with patch('core.llm.page_type_detection._analyze_with_openai', return_value=_openai_result(0.0)) as analyze:
+            detect_page_type(self.URL, html, 'tour')
+            detect_page_type(self.URL, html, 'tour')
+
+        assert analyze.call_count == 2
+
+    def test_key_depends_on_url_content_type_and_preview(self):
+        key = _page_type_cache_key(self.URL, 'preview', 'tour')
+
+        assert key == _page_type_cache_key(self.URL, 'preview', 'tour')
+        assert key != _page_type_cache_key('https://example.com/other', 'preview', 'tour')
+        assert key != _page_type_cache_key(self.URL, 'preview', 'restaurant')
+        assert key != _page_type_cache_key(self.URL, 'other preview', 'tour')
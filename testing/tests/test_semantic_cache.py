@@ -0,0 +1,78 @@
+"""
+Tests for the shared cosine-similarity cache.
+"""
+
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+
+from core.llm.semantic_cache import SemanticCache
+
+
+@pytest.fixture(autouse=True)
+def shared_cache():
+    with override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'semantic-cache-tests',
+        },
+    }):
+        caches['default'].clear()
+        yield caches['default']
+
+
+def _cache(**kwargs):
+    return SemanticCache('test', dimensions=2, **kwargs)
+
+
+class TestSemanticCache:
+
+    def test_hit_above_threshold(self):
+        cache = _cache(threshold=0.9)
+        cache.add([1.0, 0.0], 'tour')
+
+        assert cache.lookup([0.99, 0.05]) == 'tour'
+
+    def test_miss_below_threshold(self):
+        cache = _cache(threshold=0.9)
+        cache.add([1.0, 0.0], 'tour')
+
+        assert cache.lookup([0.0, 1.0]) is None
+
+    def test_entries_are_shared_between_processes(self):
+        worker_a, worker_b = _cache(), _cache()
+        worker_a.lookup([1.0, 0.0])
+        worker_b.lookup([1.0, 0.0])
+
+        worker_a.add([1.0, 0.0], 'tour')
+        worker_b.add([0.0, 1.0], 'restaurant')
+
+        # Neither write replaced the other's entry
+        for cache in (worker_a, worker_b, _cache()):
+            assert cache.lookup([1.0, 0.0]) == 'tour'
+            assert cache.lookup([0.0, 1.0]) == 'restaurant'
+
+    def test_each_add_writes_one_entry(self, shared_cache):
+        cache = _cache()
+        cache.add([1.0, 0.0], 'tour')
+        cache.add([0.0, 1.0], 'restaurant')
+
+        entries = [shared_cache.get(f'semcache:test:2:{slot}') for slot in range(3)]
+        assert [entry and entry['value'] for entry in entries] == [None, 'tour', 'restaurant']
+
+    def test_oldest_entries_are_evicted(self):
+        cache = _cache(max_entries=2)
+        cache.add([1.0, 0.0], 'tour')
+        cache.add([0.0, 1.0], 'restaurant')
+        cache.add([-1.0, 0.0], 'real_estate')
+
+        assert cache.lookup([1.0, 0.0]) is None
+        assert _cache(max_entries=2).lookup([1.0, 0.0]) is None
+        assert cache.lookup([0.0, 1.0]) == 'restaurant'
+
+    def test_rejects_vectors_of_another_dimension(self):
+        cache = _cache()
+        cache.add([1.0, 0.0, 0.0], 'tour')
+
+        assert cache.lookup([1.0, 0.0, 0.0]) is None
+        assert cache.lookup([1.0, 0.0]) is None